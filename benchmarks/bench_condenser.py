@@ -0,0 +1,141 @@
+"""
+Benchmark the job text condenser against the old 12,000-character truncation.
+
+Runs over a corpus of saved job postings (.html pages or already-scraped .txt
+files) and reports job-text tokens, total prompt tokens and condense time per
+posting. With --live, also sends both prompts to the configured model and
+compares reported prompt tokens and latency.
+
+Usage:
+    python benchmarks/bench_condenser.py CORPUS_DIR [--budget 2000] [--live]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import JOB_TEXT_TOKEN_BUDGET, RESUME_PATH, TEMPLATE_PATH  # noqa: E402
+from job_text_condenser import condense_job_text, count_tokens  # noqa: E402
+
+BASELINE_MAX_CHARS = 12000
+
+
+def load_corpus(corpus_dir: str) -> dict:
+    """Load scraped text for every posting in the corpus directory."""
+    from job_scraper import JobScraper
+
+    scraper = JobScraper(cache=False)
+    corpus = {}
+    for name in sorted(os.listdir(corpus_dir)):
+        path = os.path.join(corpus_dir, name)
+        with open(path, "r", errors="replace") as file:
+            data = file.read()
+        if name.endswith((".html", ".htm")):
+            corpus[name] = scraper.extract_text(data)
+        elif name.endswith(".txt"):
+            corpus[name] = data
+    return corpus
+
+
+def baseline_text(text: str) -> str:
+    """The job text as the old truncation would have sent it."""
+    if len(text) > BASELINE_MAX_CHARS:
+        return text[:BASELINE_MAX_CHARS] + "..."
+    return text
+
+
+def timed_completion(generator, messages):
+    """Send one completion and return (prompt_tokens, seconds)."""
+    started = time.perf_counter()
+    response = generator.client.chat.completions.create(
+        model=generator.model, messages=messages, max_tokens=2000, temperature=0
+    )
+    return response.usage.prompt_tokens, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus_dir", help="Directory of saved .html/.txt postings")
+    parser.add_argument("--budget", type=int, default=JOB_TEXT_TOKEN_BUDGET)
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Also measure real prompt tokens and latency",
+    )
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus_dir)
+    if not corpus:
+        print(f"No .html or .txt postings found in {args.corpus_dir}")
+        return
+
+    generator = None
+    if args.live:
+        from email_generator import EmailGenerator
+
+        generator = EmailGenerator(cache=False)
+        with open(TEMPLATE_PATH) as file:
+            template = file.read()
+        with open(RESUME_PATH) as file:
+            resume_text = file.read()
+
+    print(f"{'posting':40} {'baseline':>9} {'condensed':>9} {'saved':>6} {'ms':>7}")
+    rows = []
+    for name, text in corpus.items():
+        baseline = baseline_text(text)
+        started = time.perf_counter()
+        condensed = condense_job_text(text, args.budget)
+        elapsed = time.perf_counter() - started
+
+        row = {
+            "baseline_tokens": count_tokens(baseline),
+            "condensed_tokens": count_tokens(condensed),
+            "condense_seconds": elapsed,
+        }
+        saved = 1 - row["condensed_tokens"] / max(row["baseline_tokens"], 1)
+        print(
+            f"{name[:40]:40} {row['baseline_tokens']:>9} {row['condensed_tokens']:>9} "
+            f"{saved:>6.0%} {elapsed * 1000:>7.2f}"
+        )
+
+        if generator:
+            url = f"https://example.com/{name}"
+            row["baseline_prompt"], row["baseline_latency"] = timed_completion(
+                generator,
+                generator.build_messages(
+                    template, baseline, resume_text, url, token_budget=10**9
+                ),
+            )
+            row["condensed_prompt"], row["condensed_latency"] = timed_completion(
+                generator,
+                generator.build_messages(
+                    template, text, resume_text, url, token_budget=args.budget
+                ),
+            )
+        rows.append(row)
+
+    baseline_total = sum(row["baseline_tokens"] for row in rows)
+    condensed_total = sum(row["condensed_tokens"] for row in rows)
+    print(f"\nPostings: {len(rows)}  token budget: {args.budget}")
+    print(
+        f"Job text tokens: {baseline_total} -> {condensed_total} "
+        f"({1 - condensed_total / max(baseline_total, 1):.0%} fewer)"
+    )
+    print(
+        "Median condense time: "
+        f"{statistics.median(row['condense_seconds'] for row in rows) * 1000:.2f} ms"
+    )
+
+    if generator:
+        for label in ("baseline", "condensed"):
+            prompt = sum(row[f"{label}_prompt"] for row in rows)
+            latency = statistics.median(row[f"{label}_latency"] for row in rows)
+            print(f"{label:>9}: {prompt} prompt tokens, median latency {latency:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark the HTML-to-text extraction backends.
+
+Runs every available backend over a corpus of saved job pages (.html files) and
+reports throughput (MB/s and pages/s), the largest tracemalloc peak seen while
+extracting a single page, and how many pages produce exactly the same text as
+the bs4 reference backend. Without a corpus directory, --synthetic N generates
+N ATS-like pages of roughly --page-kb kilobytes each.
+
+Usage:
+    python benchmarks/bench_extraction.py CORPUS_DIR [--repeat 3]
+    python benchmarks/bench_extraction.py --synthetic 20 [--page-kb 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_extractor import available_backends, extract_text  # noqa: E402
+
+
+def load_corpus(corpus_dir: str) -> dict:
+    """Load every saved HTML page in the corpus directory."""
+    corpus = {}
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(corpus_dir, name), "r", errors="replace") as file:
+                corpus[name] = file.read()
+    return corpus
+
+
+def synthetic_page(index: int, page_kb: int) -> str:
+    """An ATS-style page: heavy scripts, navigation and a long job description."""
+    script = (
+        "<script>window.__STATE__ = " + '{"k": "%s"},' % ("x" * 200) * 40 + "</script>"
+    )
+    nav = (
+        "<nav><ul>"
+        + "".join(f"<li><a href='/{i}'>Link {i}</a></li>" for i in range(50))
+        + "</ul></nav>"
+    )
+    section = (
+        "<h2>Responsibilities</h2><ul>"
+        + "".join(
+            f"<li>Build and operate service {i} with Python &amp; Postgres</li>"
+            for i in range(20)
+        )
+        + "</ul><p>We value <b>ownership</b>, clear writing and kind reviews.</p>"
+    )
+    head = (
+        f"<html><head><title>Job {index}</title>"
+        f"<style>body {{ margin: 0 }}</style>{script}</head>"
+    )
+    body = [
+        f"<body><header>Careers</header>{nav}<main><h1>Backend Engineer {index}</h1>"
+    ]
+    size = len(head) + len(body[0])
+    while size < page_kb * 1024:
+        chunk = section + script
+        body.append(chunk)
+        size += len(chunk)
+    body.append("</main><footer>© Example Inc.</footer></body></html>")
+    return head + "".join(body)
+
+
+def measure(backend: str, corpus: dict, repeat: int) -> dict:
+    """Time a backend over the corpus and record its peak memory per page."""
+    total_bytes = sum(len(html.encode()) for html in corpus.values())
+    outputs = {}
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for name, html in corpus.items():
+            outputs[name] = extract_text(html, backend)
+    seconds = time.perf_counter() - started
+
+    peak = 0
+    for html in corpus.values():
+        tracemalloc.start()
+        extract_text(html, backend)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        "seconds": seconds,
+        "mb_per_second": total_bytes * repeat / seconds / 1e6,
+        "pages_per_second": len(corpus) * repeat / seconds,
+        "peak_mb": peak / 1e6,
+        "outputs": outputs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("corpus_dir", nargs="?")
+    parser.add_argument("--synthetic", type=int, default=0)
+    parser.add_argument("--page-kb", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.corpus_dir:
+        corpus = load_corpus(args.corpus_dir)
+    elif args.synthetic:
+        corpus = {
+            f"synthetic-{i}.html": synthetic_page(i, args.page_kb)
+            for i in range(args.synthetic)
+        }
+    else:
+        parser.error("pass a corpus directory or --synthetic N")
+    if not corpus:
+        parser.error("no .html pages found in the corpus")
+
+    total_mb = sum(len(html.encode()) for html in corpus.values()) / 1e6
+    print(f"{len(corpus)} pages, {total_mb:.1f} MB, {args.repeat} repeats\n")
+
+    results = {
+        backend: measure(backend, corpus, args.repeat)
+        for backend in available_backends()
+    }
+    reference = results.get("bs4", {}).get("outputs")
+
+    print(
+        f"{'backend':<8} {'MB/s':>8} {'pages/s':>9} {'peak MB':>9} {'same as bs4':>12}"
+    )
+    for backend, result in results.items():
+        same = "-"
+        if reference is not None:
+            matches = sum(result["outputs"][name] == reference[name] for name in corpus)
+            same = f"{matches}/{len(corpus)}"
+        print(
+            f"{backend:<8} {result['mb_per_second']:>8.1f} "
+            f"{result['pages_per_second']:>9.1f} {result['peak_mb']:>9.1f} {same:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Startup import-time regression benchmark.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter several times
+and reports the median cumulative import time of main and its slowest imports.
+Fails (exit code 1) if any heavy library is imported at startup or the median
+exceeds --max-ms.
+
+Usage:
+    python benchmarks/bench_importtime.py [--runs 5] [--max-ms 250]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must only be imported on first use
+HEAVY_MODULES = (
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "openai",
+    "bs4",
+    "requests",
+    "httpx",
+    "lxml",
+    "tiktoken",
+)
+
+
+def import_times(module: str) -> dict:
+    """Return {imported module: cumulative microseconds} for importing module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=250.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [import_times("main") for _ in range(args.runs)]
+    totals = [times["main"] / 1000 for times in runs]
+    median = statistics.median(totals)
+
+    print(f"import main: median {median:.1f} ms over {args.runs} runs")
+    print("\nSlowest imports (last run, cumulative):")
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+    for name, cumulative in slowest[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    heavy = sorted(
+        {
+            name
+            for name in runs[-1]
+            if name.split(".")[0] in HEAVY_MODULES or name.startswith("google.auth")
+        }
+    )
+    failed = False
+    if heavy:
+        roots = sorted({name.split(".")[0] for name in heavy})
+        print(f"\nFAIL: heavy modules imported at startup: {', '.join(roots)}")
+        failed = True
+    if median > args.max_ms:
+        print(f"\nFAIL: median {median:.1f} ms exceeds {args.max_ms:.1f} ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
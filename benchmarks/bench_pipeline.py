@@ -0,0 +1,282 @@
+"""
+End-to-end benchmark of the scrape -> generate -> send pipeline with local fakes.
+
+Starts a local HTTP server that serves job pages (a corpus of saved .html files,
+or --pages synthetic ones) and a mock OpenAI-compatible /v1/chat/completions
+endpoint with --llm-latency seconds of delay, and sends through a fake Gmail
+service (tests/conftest.py) that takes --gmail-latency seconds per call. Nothing
+leaves the machine.
+
+For each stage it reports throughput and p50/p99 latency (per page, per
+generation, and per recipient or per batch request for sends) together with the
+process's peak RSS so far. Campaigns are run for every size in --recipients.
+
+Usage:
+    python benchmarks/bench_pipeline.py [CORPUS_DIR] [--pages 20] [--page-kb 200]
+        [--llm-latency 0.5] [--gmail-latency 0.01] [--workers 8] [--use-batch]
+        [--recipients 10,1000,100000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_extraction import load_corpus, synthetic_page  # noqa: E402
+
+MOCK_EMAIL = (
+    "SUBJECT: Application for Backend Engineer Position\n"
+    "CONTENT: Hello,\n\n"
+    "I'm writing to express my interest in the Backend Engineer role.\n\n"
+    "I have built and operated Python services at scale.\n\n"
+    "[Job Description](https://example.com/jobs/1)"
+)
+MOCK_RESUME = "Jane Doe\nBackend engineer. Python, Postgres, Kubernetes.\n" * 20
+
+
+def make_handler(pages: dict, llm_latency: float):
+    """Request handler serving job pages and a mock chat completions endpoint."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            html = pages.get(self.path.lstrip("/"))
+            if html is None:
+                self._reply(404, b"not found", "text/plain")
+            else:
+                self._reply(200, html.encode(), "text/html; charset=utf-8")
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if not self.path.endswith("/chat/completions"):
+                self._reply(404, b"{}", "application/json")
+                return
+            time.sleep(llm_latency)
+            prompt_tokens = sum(len(m["content"]) for m in request["messages"]) // 4
+            completion_tokens = len(MOCK_EMAIL) // 4
+            body = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": MOCK_EMAIL},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+            self._reply(200, json.dumps(body).encode(), "application/json")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile of values (0 <= q <= 100)."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def report(stage: str, count: int, seconds: float, latencies: list, unit: str):
+    """Print one result row."""
+    print(
+        f"{stage:<22} {count:>8} {count / seconds:>10.1f}/s "
+        f"{percentile(latencies, 50) * 1000:>9.2f} "
+        f"{percentile(latencies, 99) * 1000:>9.2f} "
+        f"{peak_rss_mb():>9.1f}  ({unit})"
+    )
+
+
+def timed_calls(obj, name: str, latencies: list):
+    """Wrap obj.name so each call's duration is appended to latencies."""
+    func = getattr(obj, name)
+
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    setattr(obj, name, wrapper)
+
+
+def write_recipients(path: str, count: int):
+    """Write a recipient CSV with name, company and role columns."""
+    with open(path, "w") as file:
+        file.write("email,first_name,company,role\n")
+        for i in range(count):
+            file.write(
+                f"person{i}@example{i % 97}.com,Person{i},Company {i % 97},Engineer\n"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "corpus_dir", nargs="?", help="Directory of saved .html job pages"
+    )
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--page-kb", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--gmail-latency", type=float, default=0.01)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--use-batch", action="store_true", help="Send via batch requests"
+    )
+    parser.add_argument("--recipients", default="10,1000,10000")
+    args = parser.parse_args()
+
+    if args.corpus_dir:
+        corpus = load_corpus(args.corpus_dir)
+    else:
+        corpus = {
+            f"synthetic-{i}.html": synthetic_page(i, args.page_kb)
+            for i in range(args.pages)
+        }
+    if not corpus:
+        parser.error("no .html pages found in the corpus")
+    sizes = [int(size) for size in args.recipients.split(",") if size.strip()]
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_handler(corpus, args.llm_latency)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    workdir = tempfile.mkdtemp(prefix="bench-pipeline-")
+
+    # Point every component at the fakes and keep caches out of the measurements
+    os.environ.update(
+        {
+            "OPENAI_API_KEY": "bench",
+            "OPENAI_BASE_URL": f"{base_url}/v1",
+            "CACHE_DIR": workdir,
+            "PAGE_CACHE_ENABLED": "false",
+            "GENERATION_CACHE_ENABLED": "false",
+            "JOB_EXTRACTION_ENABLED": "false",
+            "STRUCTURED_EXTRACTION_ENABLED": "false",
+            "CAMPAIGN_JOURNAL_PATH": os.path.join(workdir, "campaigns.sqlite3"),
+            "SUPPRESSION_PATH": os.path.join(workdir, "suppression.sqlite3"),
+            "SEND_MAX_WORKERS": str(args.workers),
+            "SEND_RATE_LIMIT": "0",
+            "SEND_USE_BATCH": "true" if args.use_batch else "false",
+        }
+    )
+    from email_generator import EmailGenerator
+    from job_scraper import JobScraper
+    from logger import logger
+    from main import send_campaign
+    from recipient_loader import RecipientLoader
+    from tests.conftest import FakeGmail, make_sender
+
+    logger.setLevel(logging.WARNING)
+    with open(
+        os.path.join(os.path.dirname(__file__), "..", "email_template.txt")
+    ) as file:
+        template = file.read()
+
+    print(
+        f"{len(corpus)} pages, LLM latency {args.llm_latency}s, "
+        f"Gmail latency {args.gmail_latency}s, {args.workers} send workers\n"
+    )
+    print(
+        f"{'stage':<22} {'count':>8} {'throughput':>12} "
+        f"{'p50 ms':>9} {'p99 ms':>9} {'peak MB':>9}"
+    )
+
+    scraper = JobScraper(cache=False)
+    texts, latencies = [], []
+    started = time.perf_counter()
+    for name in corpus:
+        call_started = time.perf_counter()
+        texts.append(scraper.scrape_job_description(f"{base_url}/{name}"))
+        latencies.append(time.perf_counter() - call_started)
+    report("scrape", len(corpus), time.perf_counter() - started, latencies, "per page")
+    scraper.close()
+
+    generator = EmailGenerator(cache=False)
+    emails, latencies = [], []
+    started = time.perf_counter()
+    for index, text in enumerate(texts):
+        call_started = time.perf_counter()
+        emails.append(
+            generator.generate_email(
+                template, text or "", MOCK_RESUME, f"{base_url}/jobs/{index}"
+            )
+        )
+        latencies.append(time.perf_counter() - call_started)
+    report(
+        "generate", len(texts), time.perf_counter() - started, latencies, "per posting"
+    )
+
+    content, subject = next((email for email in emails if email[0]), (None, None))
+    if not content:
+        print("\nGeneration failed against the mock endpoint, skipping sends")
+        return
+
+    for size in sizes:
+        csv_path = os.path.join(workdir, f"recipients-{size}.csv")
+        write_recipients(csv_path, size)
+        sender = make_sender(FakeGmail(args.gmail_latency))
+        latencies = []
+        timed_calls(
+            sender, "_send_batch" if args.use_batch else "_send_message", latencies
+        )
+
+        started = time.perf_counter()
+        # A distinct subject per size keeps each run its own campaign in the journal
+        stats = send_campaign(
+            sender, RecipientLoader(csv_path), f"{subject} [{size}]", content
+        )
+        seconds = time.perf_counter() - started
+        report(
+            f"send {size}",
+            stats["successful"],
+            seconds,
+            latencies or [0.0],
+            "per batch request" if args.use_batch else "per recipient",
+        )
+        if stats["successful"] != size:
+            print(
+                f"  {size - stats['successful']} recipients not sent: "
+                f"{stats['failed']} failed"
+            )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from logger import logger
+
+
+class CampaignJournal:
+    """
+    Append-only record of per-recipient send status for a campaign.
+
+    Backed by SQLite in WAL mode. Status rows are buffered and committed (and
+    fsynced) in batches of flush_every rows or every flush_interval seconds, so
+    journaling doesn't add a disk sync per email. The resume check is a primary
+    key lookup, so memory stays flat however many recipients a campaign has. A
+    crash can lose at most the last unflushed batch of records.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        campaign_id: str,
+        flush_every: int = 25,
+        flush_interval: float = 1.0,
+    ):
+        """
+        Args:
+            path (str): SQLite database file
+            campaign_id (str): Identifier of the campaign being sent
+            flush_every (int): Commit after this many buffered records
+            flush_interval (float): Commit buffered records at least this often
+                (seconds)
+        """
+        self.campaign_id = campaign_id
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = []
+        # Sent recipients among the buffered records, not yet in the table
+        self._pending_sent = set()
+        self._last_flush = time.monotonic()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS deliveries (
+                campaign_id TEXT NOT NULL,
+                email TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (campaign_id, email)
+            ) WITHOUT ROWID
+            """)
+        self._conn.commit()
+
+        (sent,) = self._conn.execute(
+            "SELECT COUNT(*) FROM deliveries WHERE campaign_id = ? AND status = 'sent'",
+            (campaign_id,),
+        ).fetchone()
+        if sent:
+            logger.info(
+                f"Resuming campaign {campaign_id[:12]}: "
+                f"{sent} recipients already sent"
+            )
+
+    @staticmethod
+    def campaign_key(subject: str, content: str) -> str:
+        """Derive a campaign identifier from the email subject and content."""
+        return hashlib.sha256(f"{subject}\0{content}".encode()).hexdigest()
+
+    def is_sent(self, email: str) -> bool:
+        """Check whether email was already sent in this campaign."""
+        with self._lock:
+            if email in self._pending_sent:
+                return True
+            row = self._conn.execute(
+                "SELECT 1 FROM deliveries "
+                "WHERE campaign_id = ? AND email = ? AND status = 'sent'",
+                (self.campaign_id, email),
+            ).fetchone()
+        return row is not None
+
+    def record(self, email: str, status: str, error: Optional[str] = None):
+        """Buffer a recipient's status, flushing when the batch is full or stale."""
+        with self._lock:
+            if status == "sent":
+                self._pending_sent.add(email)
+            self._pending.append((self.campaign_id, email, status, error, time.time()))
+            if (
+                len(self._pending) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self._flush()
+
+    def flush(self):
+        """Commit all buffered records to disk."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            # Never downgrade a recipient that was already sent
+            self._conn.executemany(
+                "INSERT INTO deliveries "
+                "(campaign_id, email, status, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (campaign_id, email) DO UPDATE SET "
+                "status = excluded.status, error = excluded.error, "
+                "updated_at = excluded.updated_at "
+                "WHERE deliveries.status != 'sent'",
+                self._pending,
+            )
+            self._conn.commit()
+            self._pending = []
+            self._pending_sent.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush buffered records and close the database."""
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
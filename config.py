@@ -13,3 +13,103 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 RESUME_PATH = "resume_parsed.txt"
 DATASET_PATH = "email_dataset.csv"
 TEMPLATE_PATH = "email_template.txt"
+
+# Gmail sending
+GMAIL_TOKEN_PATH = os.getenv("GMAIL_TOKEN_PATH", "token.json")
+GMAIL_CREDENTIALS_PATH = os.getenv("GMAIL_CREDENTIALS_PATH", "credentials.json")
+TOKEN_REFRESH_MARGIN = float(
+    os.getenv("TOKEN_REFRESH_MARGIN", "300")
+)  # seconds before expiry
+SEND_MAX_WORKERS = int(os.getenv("SEND_MAX_WORKERS", "1"))
+SEND_RATE_LIMIT = float(
+    os.getenv("SEND_RATE_LIMIT", "0")
+)  # emails per second, 0 = unlimited
+SEND_BATCH_SIZE = int(os.getenv("SEND_BATCH_SIZE", "50"))  # Gmail allows at most 100
+SEND_BATCH_RETRIES = int(os.getenv("SEND_BATCH_RETRIES", "2"))
+SEND_USE_BATCH = os.getenv("SEND_USE_BATCH", "false").lower() in ("1", "true", "yes")
+
+# Caching
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", str(24 * 60 * 60)))  # seconds
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# Scraping
+HTML_EXTRACTOR = os.getenv("HTML_EXTRACTOR", "auto")  # auto, lxml, stream or bs4
+# Read schema.org JobPosting JSON-LD / ATS markup before falling back to page text
+STRUCTURED_EXTRACTION_ENABLED = os.getenv(
+    "STRUCTURED_EXTRACTION_ENABLED", "true"
+).lower() in ("1", "true", "yes")
+SCRAPE_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "30"))  # seconds
+SCRAPE_MAX_CONNECTIONS = int(os.getenv("SCRAPE_MAX_CONNECTIONS", "20"))
+SCRAPE_MAX_PER_HOST = int(os.getenv("SCRAPE_MAX_PER_HOST", "2"))  # concurrent requests
+SCRAPE_DOMAIN_DELAY = float(
+    os.getenv("SCRAPE_DOMAIN_DELAY", "1.0")
+)  # seconds between requests to a host
+SCRAPE_HTTP2 = os.getenv("SCRAPE_HTTP2", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)  # only used when the h2 package is installed
+
+# LLM generation
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # e.g. a local OpenAI-compatible server
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_REQUESTS_PER_MINUTE = float(
+    os.getenv("LLM_REQUESTS_PER_MINUTE", "0")
+)  # 0 = unlimited
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))  # 0 = unlimited
+LLM_DETERMINISTIC = os.getenv("LLM_DETERMINISTIC", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+LLM_SEED = int(os.getenv("LLM_SEED", "42"))  # used in deterministic mode
+GENERATION_CACHE_ENABLED = os.getenv("GENERATION_CACHE_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+GENERATION_CACHE_MAX_BYTES = int(
+    os.getenv("GENERATION_CACHE_MAX_BYTES", str(50 * 1024 * 1024))
+)
+# Prompt tokens spent on the job page text after condensing
+JOB_TEXT_TOKEN_BUDGET = int(os.getenv("JOB_TEXT_TOKEN_BUDGET", "2000"))
+JOB_EXTRACTION_ENABLED = os.getenv("JOB_EXTRACTION_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+JOB_RECORDS_DIR = os.getenv("JOB_RECORDS_DIR", os.path.join(CACHE_DIR, "jobs"))
+
+# Per-recipient send journal used to resume interrupted campaigns
+CAMPAIGN_JOURNAL_PATH = os.getenv("CAMPAIGN_JOURNAL_PATH", "campaigns.sqlite3")
+
+# Suppression list and contact history checked before every send
+SUPPRESSION_ENABLED = os.getenv("SUPPRESSION_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SUPPRESSION_PATH = os.getenv("SUPPRESSION_PATH", "suppression.sqlite3")
+# Skip addresses another campaign mailed within this many days (0 = never skip)
+SUPPRESSION_RECONTACT_DAYS = float(os.getenv("SUPPRESSION_RECONTACT_DAYS", "0"))
+
+# Throttling and retries for Gmail sends
+SEND_ADAPTIVE_RATE = os.getenv("SEND_ADAPTIVE_RATE", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SEND_MAX_RETRIES = int(os.getenv("SEND_MAX_RETRIES", "5"))
+
+# Per-stage timers and counters (see metrics.py); also enabled by main.py --metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
@@ -0,0 +1,254 @@
+import datetime
+import os
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from logger import logger
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive advisory lock on path (created if missing) across processes."""
+    with open(path, "a+") as handle:
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class CredentialManager:
+    """
+    One set of Gmail OAuth credentials shared by every sender in the process.
+
+    token.json is read once and the Credentials object is kept in memory, so every
+    worker's Gmail service uses the same object. Tokens are refreshed before they
+    expire, by a background thread when one is started, and refreshes take a lock
+    file next to token.json: a process that finds another one already refreshed
+    the token adopts it from disk instead of refreshing again, and token.json is
+    always replaced atomically.
+    """
+
+    _instances: Dict[Tuple[str, tuple], "CredentialManager"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        token_path: str,
+        scopes: List[str],
+        client_secrets_path: str = "credentials.json",
+        refresh_margin: float = 300,
+    ):
+        """
+        Args:
+            token_path (str): Authorized user file (token.json)
+            scopes (List[str]): OAuth scopes to request
+            client_secrets_path (str): OAuth client file for the first login
+            refresh_margin (float): Seconds before expiry at which tokens are refreshed
+        """
+        self.token_path = token_path
+        self.scopes = list(scopes)
+        self.client_secrets_path = client_secrets_path
+        self.refresh_margin = refresh_margin
+        self.lock_path = f"{token_path}.lock"
+        self.creds: Optional["Credentials"] = None
+        self._lock = threading.RLock()
+        self._refresher = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def shared(
+        cls, token_path: str, scopes: List[str], **kwargs
+    ) -> "CredentialManager":
+        """Return the process-wide manager for a token file and scopes."""
+        key = (os.path.abspath(token_path), tuple(sorted(scopes)))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(token_path, scopes, **kwargs)
+            return cls._instances[key]
+
+    def _expires_soon(self, creds: "Credentials") -> bool:
+        if not creds.token:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth keeps expiry as a naive UTC datetime
+        remaining = creds.expiry - datetime.datetime.utcnow()
+        return remaining.total_seconds() < self.refresh_margin
+
+    def _load_file(self) -> Optional["Credentials"]:
+        from google.oauth2.credentials import Credentials
+
+        if not os.path.exists(self.token_path):
+            return None
+        try:
+            return Credentials.from_authorized_user_file(self.token_path, self.scopes)
+        except Exception as e:
+            logger.error(f"Error loading credentials from {self.token_path}: {str(e)}")
+            return None
+
+    def _save(self, creds: "Credentials"):
+        temp_path = f"{self.token_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as token:
+            token.write(creds.to_json())
+        os.replace(temp_path, self.token_path)
+
+    def _adopt(self, creds: "Credentials"):
+        """Use creds, updating the shared object in place so built services see it."""
+        if self.creds is None:
+            self.creds = creds
+        else:
+            self.creds.token = creds.token
+            self.creds.expiry = creds.expiry
+
+    def _login(self) -> "Credentials":
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        logger.info(
+            f"Starting new authentication flow using {self.client_secrets_path}"
+        )
+        if not os.path.exists(self.client_secrets_path):
+            raise FileNotFoundError(
+                f"{self.client_secrets_path} file not found. "
+                "Please download it from Google Cloud Console."
+            )
+        flow = InstalledAppFlow.from_client_secrets_file(
+            self.client_secrets_path, self.scopes
+        )
+        return flow.run_local_server(
+            port=0,
+            success_message="Authentication successful! You can close this window.",
+            open_browser=True,
+        )
+
+    def _refresh_locked(self, interactive: bool):
+        """
+        Make self.creds valid, holding the cross-process lock.
+
+        When a refresh fails and credentials are already loaded, the current token
+        is kept and the refresh is retried on the next call. The browser login only
+        runs when no credentials are loaded and interactive is True; otherwise a
+        RuntimeError is raised.
+        """
+        from google.auth.transport.requests import Request
+
+        with file_lock(self.lock_path):
+            # Another process may have refreshed or created the token meanwhile
+            on_disk = self._load_file()
+            if on_disk and not self._expires_soon(on_disk):
+                logger.info(f"Loaded credentials from {self.token_path}")
+                self._adopt(on_disk)
+                return
+
+            creds = self.creds or on_disk
+            if creds and creds.refresh_token:
+                logger.info("Refreshing credentials")
+                try:
+                    creds.refresh(Request())
+                    self._adopt(creds)
+                    self._save(self.creds)
+                    return
+                except Exception as e:
+                    logger.error(f"Error refreshing credentials: {str(e)}")
+                    if self.creds is not None:
+                        logger.info("Keeping the current token, will retry refreshing")
+                        return
+                    if not interactive:
+                        raise RuntimeError(
+                            f"Could not refresh credentials from {self.token_path}"
+                        ) from e
+                    if os.path.exists(self.token_path):
+                        os.remove(self.token_path)
+
+            if self.creds is not None:
+                logger.warning("Credentials have no refresh token, keeping them")
+                return
+            if not interactive:
+                raise RuntimeError(
+                    f"No usable credentials in {self.token_path}; "
+                    "interactive login is required"
+                )
+            self._adopt(self._login())
+            logger.info(f"Saving credentials to {self.token_path}")
+            self._save(self.creds)
+
+    def get(self, interactive: bool = True) -> "Credentials":
+        """
+        Return valid credentials, loading, refreshing or logging in as needed.
+
+        Callers get the same Credentials object every time; it is refreshed in
+        place, so services built from it keep working across refreshes. Only the
+        first load can open the browser login, and only when interactive is True.
+
+        Args:
+            interactive (bool): Allow the browser login when no usable token exists
+
+        Raises:
+            RuntimeError: No credentials could be loaded without a login
+        """
+        with self._lock:
+            if self.creds is None or self._expires_soon(self.creds):
+                self._refresh_locked(interactive)
+            return self.creds
+
+    def seconds_until_refresh(self) -> Optional[float]:
+        """Seconds until the current token enters the refresh margin, or None."""
+        creds = self.creds
+        if creds is None or creds.expiry is None:
+            return None
+        remaining = (creds.expiry - datetime.datetime.utcnow()).total_seconds()
+        return max(0.0, remaining - self.refresh_margin)
+
+    def start_background_refresh(self):
+        """Refresh the token in a daemon thread ahead of expiry, off the send path."""
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._stop.clear()
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="credential-refresh", daemon=True
+            )
+            self._refresher.start()
+
+    def stop_background_refresh(self):
+        """Stop the background refresh thread."""
+        self._stop.set()
+        with self._lock:
+            refresher, self._refresher = self._refresher, None
+        if refresher is not None:
+            refresher.join()
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            wait = self.seconds_until_refresh()
+            if wait is None:
+                return
+            # Recheck at least every minute, e.g. after the machine was asleep
+            if self._stop.wait(min(max(wait, 1.0), 60.0)):
+                return
+            try:
+                creds = self.get(interactive=False)
+            except Exception as e:
+                logger.error(f"Background credential refresh failed: {str(e)}")
+                creds = None
+            if creds is None or self._expires_soon(creds):
+                # The refresh failed and the current token was kept; retry later
+                self._stop.wait(30)
@@ -1,16 +1,166 @@
-from typing import Optional, Tuple
+import asyncio
+import json
+import os
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
-import openai
-
-from config import OPENAI_API_KEY, OPENAI_MODEL
+from config import (
+    CACHE_DIR,
+    GENERATION_CACHE_ENABLED,
+    GENERATION_CACHE_MAX_BYTES,
+    JOB_EXTRACTION_ENABLED,
+    JOB_RECORDS_DIR,
+    JOB_TEXT_TOKEN_BUDGET,
+    LLM_DETERMINISTIC,
+    LLM_MAX_CONCURRENCY,
+    LLM_SEED,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    OPENAI_API_KEY,
+    OPENAI_BASE_URL,
+    OPENAI_MODEL,
+)
+from generation_cache import GenerationCache
+from job_records import (
+    JOB_RECORD_FIELDS,
+    JobRecordStore,
+    format_job_record,
+    normalize_job_record,
+)
+from job_text_condenser import condense_job_text, count_tokens
 from logger import logger
+from metrics import cached_prompt_tokens, metrics, usage_field
+from rate_limiter import AsyncTokenBucket
 
+if TYPE_CHECKING:
+    import openai
+
+SYSTEM_PROMPT = "You are a professional email writer helping to create personalized job application emails. Always format your response with SUBJECT: and CONTENT: sections. Ensure proper paragraph spacing and line breaks in the email content."
+TEMPERATURE = 0.7
+MAX_TOKENS = 2000
+EXTRACTION_SYSTEM_PROMPT = "You extract structured job postings from scraped web page text. Respond with a single JSON object only."
+EXTRACTION_MAX_TOKENS = 1000
+# Completion tokens allowed per email in a multi-variant request
+VARIANT_MAX_TOKENS = 1000
+VARIANTS_MAX_TOTAL_TOKENS = 16000
+
+
+class StreamingResponseParser:
+    """
+    Incrementally parses a streamed SUBJECT:/CONTENT: response.
+
+    The subject is reported as soon as its line is complete, and content text is
+    handed out as it arrives.
+    """
 
-class EmailGenerator:
     def __init__(self):
-        # Initialize the OpenAI client with the API key
-        self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
+        self.buffer = ""
+        self.subject = None
+        self._content_start = None
+        self._content_emitted = 0
+
+    def feed(self, delta: str) -> Tuple[Optional[str], str]:
+        """
+        Add a streamed chunk of the response.
+
+        Args:
+            delta (str): Newly received text
+
+        Returns:
+            Tuple[Optional[str], str]: (subject if it just completed, new content text)
+        """
+        self.buffer += delta
+        completed_subject = None
+
+        if self.subject is None and "SUBJECT:" in self.buffer:
+            start = self.buffer.index("SUBJECT:") + len("SUBJECT:")
+            # The subject may start on the line after SUBJECT:
+            rest = self.buffer[start:]
+            start += len(rest) - len(rest.lstrip())
+            ends = [
+                position
+                for position in (
+                    self.buffer.find("\n", start),
+                    self.buffer.find("CONTENT:", start),
+                )
+                if position != -1
+            ]
+            # Only report the subject once it is followed by a newline or CONTENT:
+            if ends and self.buffer[start : min(ends)].strip():
+                self.subject = self.buffer[start : min(ends)].strip()
+                completed_subject = self.subject
+
+        if self._content_start is None and "CONTENT:" in self.buffer:
+            self._content_start = self.buffer.index("CONTENT:") + len("CONTENT:")
+
+        new_content = ""
+        if self._content_start is not None:
+            content = self.buffer[self._content_start :]
+            if not self._content_emitted:
+                # Skip the whitespace between CONTENT: and the first word
+                stripped = content.lstrip()
+                self._content_start += len(content) - len(stripped)
+                content = stripped
+            new_content = content[self._content_emitted :]
+            self._content_emitted = len(content)
+
+        return completed_subject, new_content
+
+
+class EmailGenerator:
+    def __init__(
+        self,
+        cache: Optional[GenerationCache] = None,
+        deterministic: Optional[bool] = None,
+        regenerate: bool = False,
+    ):
+        """
+        Args:
+            cache (Optional[GenerationCache]): Generation cache to use; pass False to
+                disable caching
+            deterministic (Optional[bool]): Pin temperature and seed (defaults to
+                LLM_DETERMINISTIC)
+            regenerate (bool): Skip cache lookups so the model writes a fresh email,
+                which then replaces the cached one
+        """
+        self._client = None
         self.model = OPENAI_MODEL
+        self._async_client = None
+        self.deterministic = (
+            LLM_DETERMINISTIC if deterministic is None else deterministic
+        )
+        self.regenerate = regenerate
+        if cache is None and GENERATION_CACHE_ENABLED:
+            cache = GenerationCache(
+                os.path.join(CACHE_DIR, "generations.sqlite3"),
+                max_bytes=GENERATION_CACHE_MAX_BYTES,
+            )
+        self.cache = cache
+        self.job_records = (
+            JobRecordStore(JOB_RECORDS_DIR) if JOB_EXTRACTION_ENABLED else None
+        )
+
+    @property
+    def client(self) -> "openai.OpenAI":
+        """OpenAI client, created on first use so startup doesn't import openai."""
+        if self._client is None:
+            import openai
+
+            # Initialize the OpenAI client with the API key
+            self._client = openai.OpenAI(
+                api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL
+            )
+        return self._client
+
+    @property
+    def async_client(self) -> "openai.AsyncOpenAI":
+        """Async OpenAI client, created on first use."""
+        if self._async_client is None:
+            import openai
+
+            self._async_client = openai.AsyncOpenAI(
+                api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL
+            )
+        return self._async_client
 
     def extract_resume_text(self, resume_path: str) -> Optional[str]:
         """
@@ -29,38 +179,126 @@ class EmailGenerator:
             logger.error(f"Error extracting resume text: {str(e)}")
             return None
 
-    def generate_email(
-        self, template: str, job_page_text: str, resume_text: str, job_url: str
-    ) -> Tuple[Optional[str], Optional[str]]:
+    @metrics.timed("extract_job")
+    def extract_job(self, job_page_text: str, job_url: str) -> Optional[dict]:
         """
-        Generate personalized email using LLM in a single call.
-        This function extracts the job description from the page text and generates the email.
+        Extract a compact structured job record from the page text.
+
+        Records are stored on disk per URL together with a fingerprint of the page
+        text, so later generations for the same posting (other templates,
+        regenerations) reuse them instead of sending the page text again, until
+        the posting changes.
+
+        Args:
+            job_page_text (str): Raw text from the job posting page
+            job_url (str): URL of the job posting
+
+        Returns:
+            Optional[dict]: The job record or None if extraction fails
+        """
+        if self.job_records is None:
+            return None
+
+        record = self.job_records.get(job_url, job_page_text)
+        if record:
+            logger.info("Using stored job record")
+            return record
+
+        try:
+            condensed_text = condense_job_text(job_page_text, JOB_TEXT_TOKEN_BUDGET)
+            # Page text last, after the instructions every extraction shares
+            prompt = f"""
+            Extract the job posting from the webpage content below.
+
+            Return a JSON object with these keys: {", ".join(JOB_RECORD_FIELDS)}.
+            title, company and location are strings (null if unknown). The other
+            keys are lists of short bullet strings, keeping only details that
+            matter for a job application.
+
+            Webpage content:
+
+            {condensed_text}
+            """
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0,
+                max_tokens=EXTRACTION_MAX_TOKENS,
+                response_format={"type": "json_object"},
+            )
+            self._record_usage(response.usage)
+            record = normalize_job_record(
+                json.loads(response.choices[0].message.content)
+            )
+            if not record["title"]:
+                logger.warning("Job extraction returned no job title")
+                return None
+
+            self.job_records.put(job_url, record, job_page_text)
+            return record
+
+        except Exception as e:
+            logger.error(f"Error extracting job record: {str(e)}")
+            return None
+
+    def build_messages(
+        self,
+        template: str,
+        job_page_text: str,
+        resume_text: str,
+        job_url: str,
+        token_budget: Optional[int] = None,
+        job_record: Optional[dict] = None,
+    ) -> List[dict]:
+        """
+        Build the chat messages for generating an email.
+
+        The system prompt, instructions, template and resume form a prefix that is
+        identical for every posting, and the job content follows in its own message,
+        so providers with prompt caching (e.g. OpenAI's automatic prefix cache) only
+        process the job part of repeated requests. When a structured job record is
+        given it replaces the raw page text, so the model doesn't have to extract
+        the job description again.
 
         Args:
             template (str): Email template
             job_page_text (str): Raw text from the job posting page
             resume_text (str): Extracted resume text
             job_url (str): URL of the job posting
+            token_budget (Optional[int]): Tokens allowed for the job text
+                (defaults to JOB_TEXT_TOKEN_BUDGET)
+            job_record (Optional[dict]): Structured job record from extract_job
 
         Returns:
-            Tuple[Optional[str], Optional[str]]: A tuple containing (email_content, email_subject)
+            List[dict]: Chat completion messages
         """
-        try:
-            # Truncate text if it's too long for the API
-            max_text_length = 12000  # Adjust based on model's token limit
-            if len(job_page_text) > max_text_length:
-                job_page_text = job_page_text[:max_text_length] + "..."
-                logger.warning(
-                    f"Job page text was truncated to {max_text_length} characters"
+        if job_record is not None:
+            job_part = f"""
+            Job posting URL: {job_url}
+
+            Job description:
+
+            {format_job_record(job_record)}
+            """
+        else:
+            # Keep only the most relevant parts of the page within the token budget
+            condensed = condense_job_text(
+                job_page_text, token_budget or JOB_TEXT_TOKEN_BUDGET
+            )
+            if condensed != job_page_text:
+                logger.info(
+                    f"Job page text condensed from {len(job_page_text)} to "
+                    f"{len(condensed)} characters"
                 )
+                job_page_text = condensed
 
-            prompt = f"""
-            I need you to perform three tasks:
-            
-            1. First, extract the job description from this webpage content:
-            
-            {job_page_text}
-            
+            job_part = f"""
+            Job posting URL: {job_url}
+
+            First, extract the job description from the webpage content below.
             Please identify and extract:
             - Job title
             - Company name (if available)
@@ -68,14 +306,35 @@ class EmailGenerator:
             - Required qualifications
             - Preferred qualifications (if any)
             - Any other relevant details about the position
-            
-            2. Generate a professional email subject line that:
+
+            Webpage content:
+
+            {job_page_text}
+            """
+
+        # Static instructions, template and resume come first and the per-job
+        # content last, so consecutive requests share a prefix the provider can cache
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": self._email_instructions(template, resume_text),
+            },
+            {"role": "user", "content": job_part},
+        ]
+
+    def _email_instructions(self, template: str, resume_text: str) -> str:
+        """The job-independent prompt: how to write the subject line and email body."""
+        return f"""
+            I will give you a job posting. Write a job application email for it:
+
+            1. Generate a professional email subject line that:
                - Is concise and attention-grabbing
                - Includes the job title
                - Is no longer than 100 characters
                - Example: "Application for Senior Software Engineer Position"
             
-            3. Then, using the extracted job description, generate a personalized email using this template:
+            2. Then, using the job description, generate a personalized email using this template:
             
             {template}
             
@@ -87,7 +346,7 @@ class EmailGenerator:
             1. Follows the template structure
             2. Highlights relevant experience from the resume that matches the job description
             3. Includes a personalized greeting (use "Hello" as placeholder)
-            4. Ends with the job description link formatted as "[Job Description]({job_url})"
+            4. Ends with the job description link formatted as "[Job Description](<job posting URL>)"
             5. Maintains a professional and engaging tone
             6. Uses short, mobile-friendly paragraphs (2-3 sentences maximum)
             7. Keeps lines concise and easy to read on mobile devices
@@ -100,48 +359,473 @@ class EmailGenerator:
             CONTENT: [email content]
             """
 
+    def parse_response(self, response_text: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Split a model response into email content and subject.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: A tuple containing (email_content, email_subject)
+        """
+        subject = None
+        content = None
+
+        # Split the response into subject and content
+        if "SUBJECT:" in response_text and "CONTENT:" in response_text:
+            subject_part = (
+                response_text.split("SUBJECT:")[1].split("CONTENT:")[0].strip()
+            )
+            content_part = response_text.split("CONTENT:")[1].strip()
+
+            # Clean up the subject and content
+            subject = subject_part.split("\n")[0].strip()
+
+            # Preserve the original formatting of the content
+            content = content_part
+
+            # Only clean up empty lines while preserving paragraph spacing
+            content = "\n".join(
+                line
+                for line in content.split("\n")
+                if line.strip()
+                or line == ""  # Keep empty lines that are part of paragraph spacing
+            )
+
+        return content, subject
+
+    def _record_usage(self, usage):
+        """Count a response's token usage, logging how much of the prompt was cached."""
+        if usage is None:
+            return
+        metrics.record_usage(usage)
+        cached = cached_prompt_tokens(usage)
+        if cached:
+            prompt_tokens = usage_field(usage, "prompt_tokens")
+            logger.info(
+                f"Provider prompt cache: {cached} of {prompt_tokens} "
+                "prompt tokens cached"
+            )
+
+    def sampling_params(self) -> dict:
+        """Sampling parameters for completions; pinned in deterministic mode."""
+        if self.deterministic:
+            return {"temperature": 0, "seed": LLM_SEED}
+        return {"temperature": TEMPERATURE}
+
+    def _cached_response(
+        self, messages: List[dict]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Look up a previous response for these messages as (key, response_text)."""
+        if not self.cache:
+            return None, None
+        key = self.cache.key(self.model, messages, self.sampling_params())
+        if self.regenerate:
+            return key, None
+        cached = self.cache.get(key)
+        metrics.inc("generation_cache_hits" if cached else "generation_cache_misses")
+        return key, cached
+
+    def _parse_and_cache(
+        self, key: Optional[str], response_text: str
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Parse a fresh response and cache it if it produced a usable email."""
+        content, subject = self.parse_response(response_text)
+        if key and content and subject:
+            self.cache.put(key, response_text)
+        return content, subject
+
+    @metrics.timed("generate_email")
+    def generate_email(
+        self,
+        template: str,
+        job_page_text: str,
+        resume_text: str,
+        job_url: str,
+        job_record: Optional[dict] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Generate personalized email using LLM in a single call.
+        This function extracts the job description from the page text and generates the email.
+
+        Args:
+            template (str): Email template
+            job_page_text (str): Raw text from the job posting page
+            resume_text (str): Extracted resume text
+            job_url (str): URL of the job posting
+            job_record (Optional[dict]): Structured job record used instead of the page text
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: A tuple containing (email_content, email_subject)
+        """
+        try:
+            messages = self.build_messages(
+                template, job_page_text, resume_text, job_url, job_record=job_record
+            )
+
+            key, cached = self._cached_response(messages)
+            if cached:
+                logger.info("Using cached email generation")
+                return self.parse_response(cached)
+
             # Use the client instance to make the API call
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional email writer helping to create personalized job application emails. Always format your response with SUBJECT: and CONTENT: sections. Ensure proper paragraph spacing and line breaks in the email content.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-                max_tokens=2000,
+                messages=messages,
+                max_tokens=MAX_TOKENS,
+                **self.sampling_params(),
             )
+            self._record_usage(response.usage)
 
             # Parse the response to extract subject and content
+            return self._parse_and_cache(key, response.choices[0].message.content)
+
+        except Exception as e:
+            logger.error(f"Error generating email: {str(e)}")
+            return None, None
+
+    def build_variant_messages(
+        self,
+        template: str,
+        job_page_text: str,
+        resume_text: str,
+        job_url: str,
+        segments: List[str],
+        job_record: Optional[dict] = None,
+    ) -> List[dict]:
+        """
+        Build the chat messages for generating one email per recipient segment.
+
+        The messages for a single email are kept unchanged as a shared prefix, and
+        one follow-up message asks for every variant at once as JSON, so the job
+        text and resume are sent once however many segments there are.
+
+        Args:
+            segments (List[str]): Recipient groups, e.g. ["recruiters", "founders"]
+
+        Returns:
+            List[dict]: Chat completion messages
+        """
+        messages = self.build_messages(
+            template, job_page_text, resume_text, job_url, job_record=job_record
+        )
+        audience = "\n".join(f"- {segment}" for segment in segments)
+        messages.append(
+            {
+                "role": "user",
+                "content": f"""
+            Instead of a single email, write one version for each of these recipient groups,
+            adapting the angle and emphasis to what that group cares about:
+
+            {audience}
+
+            Each subject and content follows the instructions above. Return a JSON object
+            of the form {{"variants": [{{"segment": "...", "subject": "...", "content": "..."}}]}}
+            with one entry per group, using the group names exactly as listed.
+            """,
+            }
+        )
+        return messages
+
+    def parse_variants(
+        self, response_text: str, segments: List[str]
+    ) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """
+        Split a multi-variant JSON response into (email_content, email_subject) per segment.
+
+        Variants are matched to segments by name, falling back to their position.
+        Segments without a usable variant map to (None, None).
+        """
+        results = {segment: (None, None) for segment in segments}
+        try:
+            variants = json.loads(response_text).get("variants") or []
+        except (ValueError, AttributeError):
+            logger.error("Multi-variant response is not a JSON object")
+            return results
+
+        if not isinstance(variants, list):
+            logger.error("Multi-variant response has no list of variants")
+            return results
+        variants = [variant for variant in variants if isinstance(variant, dict)]
+        by_name = {
+            str(variant.get("segment", "")).strip().lower(): variant
+            for variant in variants
+        }
+        matched = {
+            segment: by_name.get(segment.strip().lower()) for segment in segments
+        }
+        # Variants whose name matches no segment fill the unmatched segments in order
+        unclaimed = iter(
+            variant
+            for variant in variants
+            if not any(variant is found for found in matched.values())
+        )
+        for segment in segments:
+            variant = matched[segment] or next(unclaimed, None)
+            if variant is None:
+                continue
+            content = str(variant.get("content") or "").strip() or None
+            subject = str(variant.get("subject") or "").strip().split("\n")[0] or None
+            results[segment] = (content, subject)
+        return results
+
+    @metrics.timed("generate_variants")
+    def generate_variants(
+        self,
+        template: str,
+        job_page_text: str,
+        resume_text: str,
+        job_url: str,
+        segments: List[str],
+        job_record: Optional[dict] = None,
+    ) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """
+        Generate an email variant per recipient segment in a single request.
+
+        Compared with calling generate_email once per segment, the job text and
+        resume are only sent once and the variants share one round trip, so
+        tokens and wall time grow much slower than the number of segments.
+
+        Args:
+            template (str): Email template
+            job_page_text (str): Raw text from the job posting page
+            resume_text (str): Extracted resume text
+            job_url (str): URL of the job posting
+            segments (List[str]): Recipient groups, e.g. ["recruiters", "engineering managers"]
+            job_record (Optional[dict]): Structured job record used instead of the page text
+
+        Returns:
+            Dict[str, Tuple[Optional[str], Optional[str]]]: (email_content, email_subject)
+                per segment, (None, None) where generation failed
+        """
+        segments = list(dict.fromkeys(segments))
+        if not segments:
+            return {}
+        try:
+            messages = self.build_variant_messages(
+                template, job_page_text, resume_text, job_url, segments, job_record
+            )
+
+            key, cached = self._cached_response(messages)
+            if cached:
+                logger.info("Using cached email variants")
+                return self.parse_variants(cached, segments)
+
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=min(
+                    VARIANT_MAX_TOKENS * len(segments), VARIANTS_MAX_TOTAL_TOKENS
+                ),
+                response_format={"type": "json_object"},
+                **self.sampling_params(),
+            )
+            self._record_usage(response.usage)
+
             response_text = response.choices[0].message.content
-            subject = None
-            content = None
+            variants = self.parse_variants(response_text, segments)
+            complete = all(
+                content and subject for content, subject in variants.values()
+            )
+            if key and complete:
+                self.cache.put(key, response_text)
+            return variants
 
-            # Split the response into subject and content
-            if "SUBJECT:" in response_text and "CONTENT:" in response_text:
-                subject_part = (
-                    response_text.split("SUBJECT:")[1].split("CONTENT:")[0].strip()
-                )
-                content_part = response_text.split("CONTENT:")[1].strip()
+        except Exception as e:
+            logger.error(f"Error generating email variants: {str(e)}")
+            return {segment: (None, None) for segment in segments}
 
-                # Clean up the subject and content
-                subject = subject_part.split("\n")[0].strip()
+    @metrics.timed("generate_email")
+    def generate_email_stream(
+        self,
+        template: str,
+        job_page_text: str,
+        resume_text: str,
+        job_url: str,
+        job_record: Optional[dict] = None,
+        on_subject: Optional[Callable[[str], None]] = None,
+        on_content: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Generate personalized email, streaming the response as it is produced.
 
-                # Preserve the original formatting of the content
-                content = content_part
+        on_subject is called once with the subject as soon as its line completes,
+        and on_content with each new piece of email content, so the operator can
+        start reading before the model finishes.
 
-                # Only clean up empty lines while preserving paragraph spacing
-                content = "\n".join(
-                    line
-                    for line in content.split("\n")
-                    if line.strip()
-                    or line == ""  # Keep empty lines that are part of paragraph spacing
-                )
+        Args:
+            template (str): Email template
+            job_page_text (str): Raw text from the job posting page
+            resume_text (str): Extracted resume text
+            job_url (str): URL of the job posting
+            job_record (Optional[dict]): Structured job record used instead of the page text
+            on_subject (Optional[Callable[[str], None]]): Called with the subject
+            on_content (Optional[Callable[[str], None]]): Called with content chunks
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: A tuple containing (email_content, email_subject)
+        """
+        try:
+            messages = self.build_messages(
+                template, job_page_text, resume_text, job_url, job_record=job_record
+            )
+            parser = StreamingResponseParser()
+
+            def handle(delta: str):
+                subject, content = parser.feed(delta)
+                if subject and on_subject:
+                    on_subject(subject)
+                if content and on_content:
+                    on_content(content)
+
+            key, cached = self._cached_response(messages)
+            if cached:
+                logger.info("Using cached email generation")
+                handle(cached)
+                return self.parse_response(cached)
+
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=MAX_TOKENS,
+                stream=True,
+                # The final chunk then carries the token usage (when metrics are on)
+                extra_body=(
+                    {"stream_options": {"include_usage": True}}
+                    if metrics.enabled
+                    else None
+                ),
+                **self.sampling_params(),
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    handle(chunk.choices[0].delta.content)
+                self._record_usage(getattr(chunk, "usage", None))
 
-            return content, subject
+            return self._parse_and_cache(key, parser.buffer)
 
         except Exception as e:
             logger.error(f"Error generating email: {str(e)}")
             return None, None
+
+    @metrics.timed("generate_email")
+    async def agenerate_email(
+        self,
+        template: str,
+        job_page_text: str,
+        resume_text: str,
+        job_url: str,
+        job_record: Optional[dict] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Async variant of generate_email using the AsyncOpenAI client.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: A tuple containing (email_content, email_subject)
+        """
+        try:
+            messages = self.build_messages(
+                template, job_page_text, resume_text, job_url, job_record=job_record
+            )
+
+            key, cached = self._cached_response(messages)
+            if cached:
+                logger.info(f"Using cached email generation for {job_url}")
+                return self.parse_response(cached)
+
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=MAX_TOKENS,
+                **self.sampling_params(),
+            )
+            self._record_usage(response.usage)
+            return self._parse_and_cache(key, response.choices[0].message.content)
+
+        except Exception as e:
+            logger.error(f"Error generating email for {job_url}: {str(e)}")
+            return None, None
+
+    def generate_many(
+        self,
+        template: str,
+        resume_text: str,
+        postings: List[Tuple[str, str]],
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Generate emails for many job postings concurrently.
+
+        In-flight requests are capped by a semaphore, and token buckets keep the
+        run under the provider's requests-per-minute and tokens-per-minute limits.
+
+        Args:
+            template (str): Email template
+            resume_text (str): Extracted resume text
+            postings (List[Tuple[str, str]]): (job_url, job_page_text) pairs
+            max_concurrency (Optional[int]): Max in-flight requests (defaults to LLM_MAX_CONCURRENCY)
+            requests_per_minute (Optional[float]): Defaults to LLM_REQUESTS_PER_MINUTE, 0 = unlimited
+            tokens_per_minute (Optional[float]): Defaults to LLM_TOKENS_PER_MINUTE, 0 = unlimited
+
+        Returns:
+            List[Tuple[Optional[str], Optional[str]]]: (email_content, email_subject) per posting, in order
+        """
+        return asyncio.run(
+            self._generate_many(
+                template,
+                resume_text,
+                postings,
+                max_concurrency or LLM_MAX_CONCURRENCY,
+                (
+                    LLM_REQUESTS_PER_MINUTE
+                    if requests_per_minute is None
+                    else requests_per_minute
+                ),
+                (
+                    LLM_TOKENS_PER_MINUTE
+                    if tokens_per_minute is None
+                    else tokens_per_minute
+                ),
+            )
+        )
+
+    async def _generate_many(
+        self,
+        template: str,
+        resume_text: str,
+        postings: List[Tuple[str, str]],
+        max_concurrency: int,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+        request_bucket = AsyncTokenBucket(requests_per_minute)
+        token_bucket = AsyncTokenBucket(tokens_per_minute)
+
+        async def generate(job_url: str, job_page_text: str):
+            # Estimate of prompt tokens plus the completion budget
+            prompt_tokens = (
+                count_tokens(template)
+                + count_tokens(resume_text)
+                + min(count_tokens(job_page_text), JOB_TEXT_TOKEN_BUDGET)
+            )
+            async with semaphore:
+                await request_bucket.acquire()
+                await token_bucket.acquire(prompt_tokens + MAX_TOKENS)
+                logger.info(f"Generating email for {job_url}")
+                return await self.agenerate_email(
+                    template, job_page_text, resume_text, job_url
+                )
+
+        try:
+            return await asyncio.gather(
+                *(
+                    generate(job_url, job_page_text)
+                    for job_url, job_page_text in postings
+                )
+            )
+        finally:
+            # The async client's connections belong to this event loop, so drop it
+            if self._async_client is not None:
+                await self._async_client.close()
+                self._async_client = None
@@ -1,17 +1,94 @@
-import base64
+import heapq
+import json
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.application import MIMEApplication
-from typing import List
-import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, List, Optional
+
+from campaign_journal import CampaignJournal
+from config import (
+    CACHE_DIR,
+    GMAIL_CREDENTIALS_PATH,
+    GMAIL_TOKEN_PATH,
+    SEND_ADAPTIVE_RATE,
+    SEND_BATCH_RETRIES,
+    SEND_BATCH_SIZE,
+    SEND_MAX_RETRIES,
+    SEND_MAX_WORKERS,
+    SEND_RATE_LIMIT,
+    TOKEN_REFRESH_MARGIN,
+)
+from credential_manager import CredentialManager
+from gmail_errors import (
+    QUOTA_EXHAUSTED,
+    RATE_LIMITED,
+    TRANSIENT,
+    backoff_delay,
+    classify_error,
+    retry_after,
+)
+from logger import logger
+from message_template import MessageTemplate
+from metrics import metrics
+from personalization import compile_email, recipient_fields
+from rate_limiter import AdaptiveRateLimiter, RateLimiter
+from recipient_loader import unpack_recipient
+from suppression import SuppressionIndex
+
+# Local copy of the Gmail API discovery document, so building a service is a dict lookup
+DISCOVERY_CACHE_PATH = os.path.join(CACHE_DIR, "gmail_v1_discovery.json")
+_discovery_document = None
+_discovery_lock = threading.Lock()
+
+
+def _gmail_discovery_document() -> dict:
+    """Load the Gmail v1 discovery document once, caching it on disk."""
+    global _discovery_document
+    with _discovery_lock:
+        if _discovery_document is None:
+            try:
+                with open(DISCOVERY_CACHE_PATH, "r") as file:
+                    _discovery_document = json.load(file)
+            except (OSError, ValueError):
+                from googleapiclient.discovery_cache import get_static_doc
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+                # Fall back to the document bundled with google-api-python-client
+                document = get_static_doc("gmail", "v1")
+                if document is None:
+                    raise RuntimeError("Gmail discovery document is not available")
+                os.makedirs(os.path.dirname(DISCOVERY_CACHE_PATH), exist_ok=True)
+                with open(DISCOVERY_CACHE_PATH, "w") as file:
+                    file.write(document)
+                _discovery_document = json.loads(document)
+        return _discovery_document
+
+
+def build_gmail_service(creds):
+    """Build a Gmail API service from the cached discovery document."""
+    from googleapiclient.discovery import build_from_document
+
+    return build_from_document(_gmail_discovery_document(), credentials=creds)
 
-from logger import logger
+
+# Gmail services per thread, keyed by the id of the credentials they were built with
+_thread_services = threading.local()
+
+
+def gmail_service(creds):
+    """
+    Return the current thread's Gmail service for creds, building it once.
+
+    The httplib2 transport behind googleapiclient is not thread-safe, so each
+    thread gets its own service, reused by every EmailSender on that thread.
+    """
+    services = getattr(_thread_services, "services", None)
+    if services is None:
+        services = _thread_services.services = {}
+    service = services.get(id(creds))
+    if service is None:
+        service = services[id(creds)] = build_gmail_service(creds)
+    return service
 
 
 class EmailSender:
@@ -21,55 +98,30 @@ class EmailSender:
         self.service = None
         self.pdf_path = "ai.pdf"  # PDF file path
 
-    def authenticate(self):
-        """Authenticate with Gmail API using credentials.json file."""
-        try:
-            # Check if token.json exists and load credentials from it
-            if os.path.exists("token.json"):
-                logger.info("Loading existing credentials from token.json")
-                self.creds = Credentials.from_authorized_user_file(
-                    "token.json", self.SCOPES
-                )
-
-            # If credentials are not valid, refresh or create new ones
-            if not self.creds or not self.creds.valid:
-                if self.creds and self.creds.expired and self.creds.refresh_token:
-                    logger.info("Refreshing expired credentials")
-                    try:
-                        self.creds.refresh(Request())
-                    except Exception as e:
-                        logger.error(f"Error refreshing credentials: {str(e)}")
-                        self.creds = None
-                        if os.path.exists("token.json"):
-                            os.remove("token.json")
-
-                # If still no valid credentials, create new ones
-                if not self.creds:
-                    logger.info(
-                        "Starting new authentication flow using credentials.json"
-                    )
-                    if not os.path.exists("credentials.json"):
-                        raise FileNotFoundError(
-                            "credentials.json file not found. Please download it from Google Cloud Console."
-                        )
+    def authenticate(self, interactive: bool = True):
+        """
+        Authenticate with the Gmail API.
 
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        "credentials.json", self.SCOPES
-                    )
-                    self.creds = flow.run_local_server(
-                        port=0,
-                        success_message="Authentication successful! You can close this window.",
-                        open_browser=True,
-                    )
+        Credentials come from the process-wide CredentialManager, so every sender
+        and worker shares one token that is refreshed in the background before it
+        expires, and token.json is only rewritten under a cross-process lock.
 
-                # Save the credentials for future use
-                logger.info("Saving credentials to token.json")
-                with open("token.json", "w") as token:
-                    token.write(self.creds.to_json())
+        Args:
+            interactive (bool): Open the browser login if there is no usable token;
+                when False, raise instead
+        """
+        try:
+            manager = CredentialManager.shared(
+                GMAIL_TOKEN_PATH,
+                self.SCOPES,
+                client_secrets_path=GMAIL_CREDENTIALS_PATH,
+                refresh_margin=TOKEN_REFRESH_MARGIN,
+            )
+            self.creds = manager.get(interactive=interactive)
+            manager.start_background_refresh()
 
-            # Build the Gmail service
             logger.info("Building Gmail service")
-            self.service = build("gmail", "v1", credentials=self.creds)
+            self.service = gmail_service(self.creds)
             logger.info("Gmail service built successfully")
 
         except Exception as e:
@@ -77,83 +129,32 @@ class EmailSender:
             self.service = None
             raise
 
+    @metrics.timed("create_message")
     def create_message(self, to: str, subject: str, message_text: str) -> dict:
         """Create a message for an email."""
-        # Convert markdown-style links to HTML links
-        message_text = re.sub(
-            r"\[(.*?)\]\((.*?)\)",
-            r'<a href="\2" style="color: #0366d6; text-decoration: none;">\1</a>',
-            message_text,
-        )
-
-        # Convert plain URLs to clickable links (if any remain)
-        url_pattern = r'(?<!href=")(https?://\S+)(?!")'
-        message_text = re.sub(
-            url_pattern,
-            r'<a href="\1" style="color: #0366d6; text-decoration: none;">\1</a>',
-            message_text,
-        )
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    margin: 0;
-                    padding: 15px;
-                    max-width: 100%;
-                    color: #24292e;
-                }}
-                p {{
-                    margin-bottom: 1em;
-                    word-wrap: break-word;
-                }}
-                a {{
-                    color: #0366d6;
-                    text-decoration: none;
-                }}
-                a:hover {{
-                    text-decoration: underline;
-                }}
-                @media screen and (max-width: 600px) {{
-                    body {{
-                        padding: 10px;
-                    }}
-                }}
-            </style>
-        </head>
-        <body>
-            {message_text.replace("\n\n", "</p><p>").replace("\n", "<br>")}
-        </body>
-        </html>
-        """
-
-        # Create the root message as multipart
-        message = MIMEMultipart()
-        message["to"] = to
-        message["subject"] = subject
-
-        # Add HTML body
-        html_part = MIMEText(html_content, "html")
-        message.attach(html_part)
-
-        # Add PDF attachment if it exists
-        if os.path.exists(self.pdf_path):
-            with open(self.pdf_path, "rb") as pdf_file:
-                pdf_attachment = MIMEApplication(pdf_file.read(), _subtype="pdf")
-                pdf_attachment.add_header(
-                    "Content-Disposition",
-                    "attachment",
-                    filename=os.path.basename(self.pdf_path),
-                )
-                message.attach(pdf_attachment)
+        return MessageTemplate(subject, message_text, self.pdf_path).render(to)
 
-        return {"raw": base64.urlsafe_b64encode(message.as_bytes()).decode()}
+    def compile_template(self, subject: str, template: str) -> MessageTemplate:
+        """
+        Pre-render a campaign message once so it can be stamped out per recipient.
+
+        The greeting gets a {{first_name}} slot, and any other {{field}} slots in the
+        subject or body (e.g. {{company}} or {{role}}) are filled per recipient from
+        their CSV columns by MessageTemplate.render.
+        """
+        return MessageTemplate(subject, compile_email(template), self.pdf_path)
+
+    def _thread_service(self):
+        """
+        Return a Gmail service object for the current thread.
+
+        Worker threads get their own service built from the shared credentials
+        (see gmail_service). When no credentials are loaded (e.g. a fake service
+        was injected), the shared service is returned as-is.
+        """
+        if self.creds is None or threading.current_thread() is threading.main_thread():
+            return self.service
+        return gmail_service(self.creds)
 
     def send_email(self, to: str, subject: str, message_text: str) -> bool:
         """
@@ -168,69 +169,493 @@ class EmailSender:
             bool: True if email sent successfully, False otherwise
         """
         try:
-            if not self.service:
-                logger.info("Gmail service not initialized, authenticating...")
-                self.authenticate()
-                if not self.service:
-                    logger.error("Failed to initialize Gmail service")
-                    return False
-
-            logger.info(f"Sending email to {to}")
-            logger.info(f"Subject: {subject}")
-            logger.debug(
-                f"Message: {message_text}"
-            )  # Changed to debug level for long messages
-
-            message = self.create_message(to, subject, message_text)
-            if not message:
-                logger.error("Failed to create email message")
-                return False
-
-            self.service.users().messages().send(userId="me", body=message).execute()
-            logger.info(f"Email sent successfully to {to}")
+            self._send(to, subject, message_text)
             return True
         except Exception as e:
             logger.error(f"Error sending email: {str(e)}")
             return False
 
+    def _send(self, to: str, subject: str, message_text: str):
+        """Send an email, raising on failure."""
+        logger.debug(
+            f"Message: {message_text}"
+        )  # Changed to debug level for long messages
+
+        message = self.create_message(to, subject, message_text)
+        if not message:
+            raise RuntimeError("Failed to create email message")
+
+        self._send_message(to, subject, message)
+
+    @metrics.timed("send_email")
+    def _send_message(self, to: str, subject: str, message: dict):
+        """Send an already-built message body, raising on failure."""
+        if not self.service:
+            logger.info("Gmail service not initialized, authenticating...")
+            self.authenticate()
+            if not self.service:
+                raise RuntimeError("Failed to initialize Gmail service")
+
+        logger.info(f"Sending email to {to}")
+        logger.info(f"Subject: {subject}")
+
+        self._thread_service().users().messages().send(
+            userId="me", body=message
+        ).execute()
+        logger.info(f"Email sent successfully to {to}")
+
+    def _send_to_recipient(
+        self,
+        email: str,
+        fields: dict,
+        prepared: MessageTemplate,
+        limiter: RateLimiter,
+    ) -> dict:
+        """
+        Send the personalized email to one recipient and return its result.
+
+        Failures are classified; rate-limited and transient ones come back with
+        status "retry" so the caller can requeue them.
+        """
+        result = {"email": email, "status": "failed", "error": None}
+        try:
+            if not email or not isinstance(email, str):
+                logger.warning(f"Skipping invalid email address: {email}")
+                result["error"] = "invalid email address"
+                return result
+
+            message = prepared.render(email, recipient_fields(email, fields))
+
+            limiter.acquire()
+            self._send_message(email, prepared.subject, message)
+            limiter.on_success()
+            result["status"] = "sent"
+        except Exception as e:
+            kind = classify_error(e)
+            result["error"] = str(e)
+            result["error_kind"] = kind
+            result["retry_after"] = retry_after(e)
+            if kind == RATE_LIMITED:
+                limiter.on_throttle()
+            if kind in (RATE_LIMITED, TRANSIENT):
+                logger.warning(f"Temporary error sending to {email}: {str(e)}")
+                result["status"] = "retry"
+            else:
+                logger.error(f"Error processing email {email}: {str(e)}")
+        return result
+
+    def _record_result(
+        self,
+        stats: dict,
+        result: dict,
+        journal: Optional[CampaignJournal],
+        suppression: Optional[SuppressionIndex] = None,
+    ):
+        """Add a recipient's result to the stats, journal and contact history."""
+        if "results" in stats:
+            stats["results"].append(result)
+        metrics.inc(f"emails_{result['status']}")
+        if result["status"] == "sent":
+            stats["successful"] += 1
+            if suppression:
+                suppression.record_sent(result["email"])
+        elif result["status"] == "skipped":
+            stats["skipped"] += 1
+            return
+        elif result["status"] == "suppressed":
+            stats["suppressed"] += 1
+            return
+        else:
+            stats["failed"] += 1
+
+        if journal and isinstance(result["email"], str):
+            journal.record(result["email"], result["status"], result["error"])
+
+    def _suppressed(
+        self, email, suppression: Optional[SuppressionIndex], record
+    ) -> bool:
+        """Record and report a recipient the suppression index rules out."""
+        if not suppression or not isinstance(email, str):
+            return False
+        reason = suppression.check(email)
+        if reason:
+            logger.info(f"Skipping {email}: {reason}")
+            record({"email": email, "status": "suppressed", "error": reason})
+        return bool(reason)
+
     def send_bulk_emails(
-        self, recipients: List[str], subject: str, template: str
+        self,
+        recipients: Iterable,
+        subject: str,
+        template: str,
+        max_workers: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        journal: Optional[CampaignJournal] = None,
+        suppression: Optional[SuppressionIndex] = None,
+        keep_results: bool = False,
     ) -> dict:
         """
         Send emails to multiple recipients.
 
+        Rate-limited and transient Gmail errors are requeued with jittered
+        exponential backoff (up to SEND_MAX_RETRIES times) while the send rate
+        adapts to throttling. A daily quota error stops the run so the remaining
+        recipients can be resumed later.
+
         Args:
-            recipients (List[str]): List of recipient email addresses
+            recipients (Iterable): Recipient email addresses, or RecipientLoader rows
             subject (str): Email subject
-            template (str): Email template with placeholder for name
+            template (str): Email content; its greeting and {{field}} slots are
+                personalized per recipient
+            max_workers (Optional[int]): Number of concurrent send workers
+                (defaults to SEND_MAX_WORKERS)
+            rate_limit (Optional[float]): Maximum emails per second across all
+                workers (defaults to SEND_RATE_LIMIT, 0 = unlimited)
+            journal (Optional[CampaignJournal]): Records each recipient's status and
+                skips recipients already sent in an earlier run
+            suppression (Optional[SuppressionIndex]): Skips duplicate, suppressed and
+                recently contacted addresses and records successful sends
+            keep_results (bool): Also return every recipient's result under "results".
+                Off by default so memory doesn't grow with the recipient list; the
+                journal records each recipient's status either way
 
         Returns:
             dict: Statistics about sent emails
         """
-        stats = {"total": len(recipients), "successful": 0, "failed": 0}
+        max_workers = max(1, max_workers or SEND_MAX_WORKERS)
+        rate_limit = SEND_RATE_LIMIT if rate_limit is None else rate_limit
+        if SEND_ADAPTIVE_RATE:
+            # Start at the cap (or unlimited), back off on throttling, recover up to it
+            limiter = AdaptiveRateLimiter(rate_limit, max_rate=rate_limit or None)
+        else:
+            limiter = RateLimiter(rate_limit)
+        stats = {
+            "total": 0,
+            "successful": 0,
+            "failed": 0,
+            "skipped": 0,
+            "suppressed": 0,
+        }
+        if keep_results:
+            stats["results"] = []
+        prepared = self.compile_template(subject, template)
+
+        def record(result: dict):
+            self._record_result(stats, result, journal, suppression)
+
+        # Authenticate once up front so the workers don't race to do it
+        if not self.service:
+            logger.info("Gmail service not initialized, authenticating...")
+            self.authenticate()
+
+        if max_workers > 1:
+            logger.info(f"Sending with {max_workers} concurrent workers")
+
+        source = iter(recipients)
+        exhausted = False
+        stopped = False
+        retries = []  # heap of (ready_at, sequence, attempt, email, fields)
+        sequence = 0
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        try:
+            while True:
+                # Keep a bounded window of queued sends, preferring due retries
+                while not stopped and len(pending) < max_workers * 2:
+                    if retries and retries[0][0] <= time.monotonic():
+                        _, _, attempt, email, fields = heapq.heappop(retries)
+                    elif not exhausted:
+                        try:
+                            email, fields = unpack_recipient(next(source))
+                        except StopIteration:
+                            exhausted = True
+                            continue
+                        stats["total"] += 1
+                        attempt = 0
+                        if journal and journal.is_sent(email):
+                            record({"email": email, "status": "skipped", "error": None})
+                            continue
+                        if self._suppressed(email, suppression, record):
+                            continue
+                    else:
+                        break
+                    future = executor.submit(
+                        self._send_to_recipient, email, fields, prepared, limiter
+                    )
+                    pending[future] = (email, fields, attempt)
+
+                if not pending:
+                    if retries and not stopped:
+                        time.sleep(max(0.0, retries[0][0] - time.monotonic()))
+                        continue
+                    break
+
+                # Wake up for the next retry only if the window has room to queue it;
+                # otherwise a due retry would turn this into a busy loop
+                timeout = None
+                if retries and not stopped and len(pending) < max_workers * 2:
+                    timeout = max(0.0, retries[0][0] - time.monotonic())
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    email, fields, attempt = pending.pop(future)
+                    result = future.result()
+                    result["attempts"] = attempt + 1
+                    if result["status"] == "retry":
+                        metrics.inc("send_retries")
+                        if attempt < SEND_MAX_RETRIES and not stopped:
+                            delay = result["retry_after"] or backoff_delay(attempt)
+                            logger.info(f"Retrying {email} in {delay:.1f}s")
+                            sequence += 1
+                            heapq.heappush(
+                                retries,
+                                (
+                                    time.monotonic() + delay,
+                                    sequence,
+                                    attempt + 1,
+                                    email,
+                                    fields,
+                                ),
+                            )
+                            continue
+                        result["status"] = "failed"
+                    elif result.get("error_kind") == QUOTA_EXHAUSTED and not stopped:
+                        logger.error(
+                            "Gmail sending quota exhausted, stopping. "
+                            "Re-run later to resume the remaining recipients."
+                        )
+                        stopped = True
+                    record(result)
+
+            # Retries still waiting when the run stopped count as failed
+            for _, _, attempt, email, _ in retries:
+                record(
+                    {
+                        "email": email,
+                        "status": "failed",
+                        "error": "not retried: quota exhausted",
+                        "attempts": attempt,
+                    }
+                )
+        except BaseException:
+            # Interrupted (e.g. Ctrl-C): drop the queued sends, wait for the ones
+            # already running and journal them, so a resumed run doesn't resend them
+            executor.shutdown(cancel_futures=True)
+            for future, (email, _, attempt) in pending.items():
+                if future.cancelled() or future.exception() is not None:
+                    continue
+                result = future.result()
+                result["attempts"] = attempt + 1
+                if result["status"] == "retry":
+                    result["status"] = "failed"
+                record(result)
+            raise
+        finally:
+            executor.shutdown()
+
+        if isinstance(limiter, AdaptiveRateLimiter) and limiter.rate:
+            logger.info(f"Final send rate: {limiter.rate:.2f} emails/second")
+        return stats
+
+    def _send_batch(
+        self, recipients: List[tuple], prepared: MessageTemplate, max_retries: int
+    ) -> List[dict]:
+        """
+        Send one chunk of emails as Gmail batch requests.
+
+        Each message becomes a sub-request of a single batch HTTP call. Failed
+        sub-requests are collected and only those are resent, up to max_retries times,
+        unless the sending quota is exhausted.
+
+        Args:
+            recipients (List[tuple]): (email, fields) pairs
+            prepared (MessageTemplate): Pre-rendered campaign message
+            max_retries (int): Times to resend failed members
+
+        Returns:
+            List[dict]: Per-recipient results in the same order as recipients
+        """
+        emails = [email for email, _ in recipients]
+        results = [
+            {"email": email, "status": "failed", "error": None} for email in emails
+        ]
+        messages = []
+        pending = []
+        for index, (email, fields) in enumerate(recipients):
+            try:
+                messages.append(prepared.render(email, recipient_fields(email, fields)))
+                pending.append(index)
+            except Exception as e:
+                logger.error(f"Error creating message for {email}: {str(e)}")
+                messages.append(None)
+                results[index]["error"] = str(e)
+
+        attempt = 0
+        while pending:
+            errors = {}
+
+            def callback(request_id, response, exception):
+                if exception is not None:
+                    errors[request_id] = exception
+
+            batch = self.service.new_batch_http_request(callback=callback)
+            for index in pending:
+                batch.add(
+                    self.service.users()
+                    .messages()
+                    .send(userId="me", body=messages[index]),
+                    request_id=str(index),
+                )
 
-        for email in recipients:
             try:
-                if not email or not isinstance(email, str):
-                    logger.warning(f"Skipping invalid email address: {email}")
-                    stats["failed"] += 1
+                with metrics.timer("send_batch"):
+                    batch.execute()
+            except Exception as e:
+                # The batch request itself failed, so every member is unsent
+                logger.error(f"Batch request failed: {str(e)}")
+                errors = {str(index): e for index in pending}
+
+            failed = []
+            delays = []
+            for index in pending:
+                error = errors.get(str(index))
+                if error is None:
+                    results[index]["status"] = "sent"
+                    results[index]["error"] = None
+                    logger.info(f"Email sent successfully to {emails[index]}")
                     continue
 
-                # Extract name from email (assuming format: name@domain.com)
-                name = email.split("@")[0].replace(".", " ").title()
-                if not name:
-                    logger.warning(f"Could not extract name from email: {email}")
-                    name = "there"  # Fallback to a generic greeting
+                results[index]["error"] = str(error)
+                results[index]["error_kind"] = classify_error(error)
+                if results[index]["error_kind"] in (RATE_LIMITED, TRANSIENT):
+                    failed.append(index)
+                    delays.append(retry_after(error) or 0)
+                else:
+                    logger.error(
+                        f"Error sending email to {emails[index]}: "
+                        f"{results[index]['error']}"
+                    )
 
-                # Replace placeholder with actual name
-                personalized_message = template.replace("Hello", f"Hello {name}")
+            attempt += 1
+            quota_exhausted = any(
+                results[index].get("error_kind") == QUOTA_EXHAUSTED for index in pending
+            )
+            if not failed or attempt > max_retries or quota_exhausted:
+                for index in failed:
+                    logger.error(
+                        f"Error sending email to {emails[index]}: "
+                        f"{results[index]['error']}"
+                    )
+                break
+
+            # Only temporary failures are resent, after a jittered backoff
+            logger.warning(
+                f"Retrying {len(failed)} failed message(s) in batch "
+                f"(attempt {attempt}/{max_retries})"
+            )
+            time.sleep(max([backoff_delay(attempt)] + delays))
+            pending = failed
+
+        return results
+
+    def send_bulk_emails_batched(
+        self,
+        recipients: Iterable,
+        subject: str,
+        template: str,
+        batch_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        journal: Optional[CampaignJournal] = None,
+        suppression: Optional[SuppressionIndex] = None,
+        keep_results: bool = False,
+    ) -> dict:
+        """
+        Send emails to multiple recipients using Gmail batch HTTP requests.
 
-                if self.send_email(email, subject, personalized_message):
-                    stats["successful"] += 1
-                else:
-                    stats["failed"] += 1
-            except Exception as e:
-                logger.error(f"Error processing email {email}: {str(e)}")
-                stats["failed"] += 1
+        Groups up to batch_size messages into a single HTTP round trip instead of
+        one request per recipient. A daily quota error stops the run after the
+        current batch so the remaining recipients can be resumed later.
+
+        Args:
+            recipients (Iterable): Recipient email addresses, or RecipientLoader rows
+            subject (str): Email subject
+            template (str): Email content; its greeting and {{field}} slots are
+                personalized per recipient
+            batch_size (Optional[int]): Messages per batch request
+                (defaults to SEND_BATCH_SIZE, capped at Gmail's limit of 100)
+            max_retries (Optional[int]): Times to resend failed batch members
+                (defaults to SEND_BATCH_RETRIES)
+            journal (Optional[CampaignJournal]): Records each recipient's status and
+                skips recipients already sent in an earlier run
+            suppression (Optional[SuppressionIndex]): Skips duplicate, suppressed and
+                recently contacted addresses and records successful sends
+            keep_results (bool): Also return every recipient's result under "results".
+                Off by default so memory doesn't grow with the recipient list; the
+                journal records each recipient's status either way
+
+        Returns:
+            dict: Statistics about sent emails
+        """
+        batch_size = min(max(1, batch_size or SEND_BATCH_SIZE), 100)
+        max_retries = SEND_BATCH_RETRIES if max_retries is None else max_retries
+        stats = {
+            "total": 0,
+            "successful": 0,
+            "failed": 0,
+            "skipped": 0,
+            "suppressed": 0,
+        }
+        if keep_results:
+            stats["results"] = []
+        prepared = self.compile_template(subject, template)
+
+        def record(result: dict):
+            self._record_result(stats, result, journal, suppression)
+
+        def send_chunk(chunk: List[tuple]) -> bool:
+            """Send and record a chunk, returning False once the quota is exhausted."""
+            logger.info(f"Sending batch of {len(chunk)} emails")
+            results = self._send_batch(chunk, prepared, max_retries)
+            for result in results:
+                record(result)
+            if any(result.get("error_kind") == QUOTA_EXHAUSTED for result in results):
+                logger.error(
+                    "Gmail sending quota exhausted, stopping. "
+                    "Re-run later to resume the remaining recipients."
+                )
+                return False
+            return True
+
+        if not self.service:
+            logger.info("Gmail service not initialized, authenticating...")
+            self.authenticate()
+
+        chunk = []
+        for recipient in recipients:
+            email, fields = unpack_recipient(recipient)
+            stats["total"] += 1
+            if not email or not isinstance(email, str):
+                logger.warning(f"Skipping invalid email address: {email}")
+                record(
+                    {
+                        "email": email,
+                        "status": "failed",
+                        "error": "invalid email address",
+                    }
+                )
+                continue
+            if journal and journal.is_sent(email):
+                record({"email": email, "status": "skipped", "error": None})
+                continue
+            if self._suppressed(email, suppression, record):
+                continue
+
+            chunk.append((email, fields))
+            if len(chunk) == batch_size:
+                if not send_chunk(chunk):
+                    return stats
+                chunk = []
+
+        if chunk:
+            send_chunk(chunk)
 
         return stats
@@ -0,0 +1,48 @@
+import hashlib
+import json
+from typing import List, Optional
+
+from cache_store import SqliteCache
+
+
+class GenerationCache:
+    """
+    Persistent cache of LLM responses keyed by a fingerprint of the request.
+
+    The fingerprint covers the model, every chat message (system prompt and rendered
+    prompt) and the sampling parameters, so any change to the template, resume, job
+    text or settings produces a new key.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Args:
+            path (str): SQLite database file
+            max_bytes (int): Size bound for LRU eviction
+        """
+        self.store = SqliteCache(path, max_bytes)
+
+    @staticmethod
+    def key(model: str, messages: List[dict], params: dict) -> str:
+        """Return the fingerprint for a chat completion request."""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params}, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None."""
+        entry = self.store.get(key)
+        return entry["response_text"] if entry else None
+
+    def put(self, key: str, response_text: str):
+        """Store a response text under key."""
+        self.store.put(key, {"response_text": response_text})
+
+    @property
+    def hits(self) -> int:
+        return self.store.hits
+
+    @property
+    def misses(self) -> int:
+        return self.store.misses
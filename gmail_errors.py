@@ -0,0 +1,74 @@
+import json
+import random
+import socket
+import ssl
+from typing import Optional, Set
+
+# Outcomes of classifying a failed Gmail API call
+RATE_LIMITED = "rate_limited"  # slow down and retry
+TRANSIENT = "transient"  # retry after a backoff
+QUOTA_EXHAUSTED = "quota_exhausted"  # stop the run, resume later
+PERMANENT = "permanent"  # don't retry this recipient
+
+RATE_LIMIT_REASONS = {"userRateLimitExceeded", "rateLimitExceeded"}
+QUOTA_REASONS = {"dailyLimitExceeded", "quotaExceeded"}
+TRANSIENT_STATUSES = {408, 500, 502, 503, 504}
+# Network failures worth retrying; other OSErrors (a missing attachment, a
+# permission problem) won't go away on retry
+TRANSIENT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    socket.timeout,
+    socket.gaierror,
+    ssl.SSLError,
+)
+
+
+def error_reasons(error: Exception) -> Set[str]:
+    """Return the Google API error reasons (e.g. userRateLimitExceeded) of an error."""
+    try:
+        data = json.loads(error.content.decode("utf-8"))
+        return {item.get("reason") for item in data["error"].get("errors", [])}
+    except Exception:
+        return set()
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Classify a send failure.
+
+    Works on googleapiclient HttpError (via its resp.status and JSON content) and on
+    network exceptions; anything unrecognized is treated as permanent.
+    """
+    resp = getattr(error, "resp", None)
+    status = getattr(resp, "status", None)
+    if status is not None:
+        status = int(status)
+        reasons = error_reasons(error)
+        if reasons & QUOTA_REASONS:
+            return QUOTA_EXHAUSTED
+        if status == 429 or reasons & RATE_LIMIT_REASONS:
+            return RATE_LIMITED
+        if status in TRANSIENT_STATUSES:
+            return TRANSIENT
+        return PERMANENT
+
+    if isinstance(error, TRANSIENT_ERRORS):
+        return TRANSIENT
+    return PERMANENT
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Return the server's Retry-After delay in seconds, if it sent one."""
+    resp = getattr(error, "resp", None)
+    try:
+        value = resp.get("retry-after") if resp is not None else None
+        return float(value) if value is not None else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Exponential backoff with jitter: half fixed, half random, capped."""
+    delay = min(cap, base * 2**attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -0,0 +1,184 @@
+import importlib.util
+from html.parser import HTMLParser
+from typing import List, Optional
+
+from logger import logger
+
+# Subtrees whose text never belongs in the job description
+DROP_TAGS = {"script", "style", "nav", "header", "footer", "iframe", "meta"}
+# Elements whose text is used as the page content, in order of preference
+CONTENT_TAGS = ("main", "article", "body")
+
+BACKENDS = ("lxml", "stream", "bs4")
+
+
+class _TextCollector:
+    """
+    Parser target that keeps page text while the document is being parsed.
+
+    Text inside DROP_TAGS is discarded as it streams past, so no tree is built and
+    nothing is removed afterwards. The collector remembers where the first main,
+    article and body elements start and end in the collected lines, so the
+    content element can be chosen once parsing is done.
+    """
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.spans = {}
+        self._open = {}
+        self._buffer = []
+        self._drop_tag = None
+        self._drop_depth = 0
+
+    def start(self, tag: str, attrib=None):
+        self._flush()
+        tag = tag.lower()
+        if self._drop_tag:
+            if tag == self._drop_tag:
+                self._drop_depth += 1
+            return
+        if tag in DROP_TAGS:
+            # meta is a void element: it has no text and never gets an end tag
+            if tag != "meta":
+                self._drop_tag, self._drop_depth = tag, 1
+            return
+        if tag in CONTENT_TAGS:
+            if tag not in self.spans:
+                self.spans[tag] = [len(self.lines), None]
+                self._open[tag] = 1
+            elif tag in self._open:
+                self._open[tag] += 1
+
+    def end(self, tag: str):
+        self._flush()
+        tag = tag.lower()
+        if self._drop_tag:
+            if tag == self._drop_tag:
+                self._drop_depth -= 1
+                if not self._drop_depth:
+                    self._drop_tag = None
+            return
+        if tag in self._open:
+            self._open[tag] -= 1
+            if not self._open[tag]:
+                del self._open[tag]
+                self.spans[tag][1] = len(self.lines)
+
+    def data(self, text: str):
+        if not self._drop_tag:
+            self._buffer.append(text)
+
+    def _flush(self):
+        # Parsers may deliver one text node in several chunks
+        if self._buffer:
+            line = "".join(self._buffer).strip()
+            self._buffer = []
+            if line:
+                self.lines.append(line)
+
+    def close(self) -> str:
+        self._flush()
+        for tag in CONTENT_TAGS:
+            if tag in self.spans:
+                start, end = self.spans[tag]
+                return "\n".join(self.lines[start:end])
+        return "\n".join(self.lines)
+
+
+class _StreamingParser(HTMLParser):
+    """Standard library HTMLParser feeding a _TextCollector."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.collector = _TextCollector()
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+def _extract_lxml(html: str) -> str:
+    from lxml import etree
+
+    parser = etree.HTMLParser(target=_TextCollector())
+    parser.feed(html)
+    return parser.close()
+
+
+def _extract_stream(html: str) -> str:
+    parser = _StreamingParser()
+    parser.feed(html)
+    parser.close()
+    return parser.collector.close()
+
+
+def _extract_bs4(html: str) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove unnecessary elements that might contain irrelevant text
+    for element in soup(list(DROP_TAGS)):
+        element.extract()
+
+    # Get the main content
+    main_content = soup.find("main") or soup.find("article") or soup.find("body")
+
+    if main_content:
+        # One line per non-empty text element
+        return "\n".join(main_content.stripped_strings)
+    else:
+        # Fallback: get all text from the page
+        return soup.get_text(separator="\n", strip=True)
+
+
+_EXTRACTORS = {"lxml": _extract_lxml, "stream": _extract_stream, "bs4": _extract_bs4}
+
+
+def available_backends() -> List[str]:
+    """Return the extraction backends usable in this environment."""
+    modules = {"lxml": "lxml", "bs4": "bs4"}
+    return [
+        backend
+        for backend in BACKENDS
+        if backend not in modules or importlib.util.find_spec(modules[backend])
+    ]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Resolve "auto" (or None) to the fastest available backend."""
+    if backend and backend != "auto":
+        if backend not in _EXTRACTORS:
+            raise ValueError(f"Unknown HTML extraction backend: {backend}")
+        return backend
+    return "lxml" if "lxml" in available_backends() else "stream"
+
+
+def extract_text(html: str, backend: Optional[str] = None) -> str:
+    """
+    Extract the readable text from a job page.
+
+    Keeps the text of the first main, article or body element (in that order of
+    preference), one line per text node, without script, style, navigation,
+    header and footer content.
+
+    Args:
+        html (str): Raw HTML of the page
+        backend (Optional[str]): "lxml", "stream", "bs4" or "auto"
+
+    Returns:
+        str: The page text, one line per text element
+    """
+    backend = resolve_backend(backend)
+    try:
+        return _EXTRACTORS[backend](html)
+    except Exception as e:
+        if backend == "bs4":
+            raise
+        logger.warning(f"{backend} extraction failed ({str(e)}), falling back to bs4")
+        return _extract_bs4(html)
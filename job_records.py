@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+from typing import Optional
+
+from logger import logger
+from page_cache import normalize_url
+
+# Fields of a structured job record, in the order they are shown in prompts
+JOB_RECORD_FIELDS = (
+    "title",
+    "company",
+    "location",
+    "responsibilities",
+    "required_qualifications",
+    "preferred_qualifications",
+    "other_details",
+)
+
+
+def normalize_job_record(data: dict) -> dict:
+    """Keep the known job record fields, coercing list fields to lists of strings."""
+    record = {}
+    for field in JOB_RECORD_FIELDS:
+        value = data.get(field)
+        if field in ("title", "company", "location"):
+            record[field] = str(value).strip() if value else None
+        elif isinstance(value, list):
+            record[field] = [str(item).strip() for item in value if str(item).strip()]
+        elif value:
+            record[field] = [str(value).strip()]
+        else:
+            record[field] = []
+    return record
+
+
+def format_job_record(record: dict) -> str:
+    """Render a job record as compact text for a prompt."""
+    lines = []
+    for field in JOB_RECORD_FIELDS:
+        value = record.get(field)
+        if not value:
+            continue
+        label = field.replace("_", " ").capitalize()
+        if isinstance(value, list):
+            lines.append(f"{label}:")
+            lines.extend(f"- {item}" for item in value)
+        else:
+            lines.append(f"{label}: {value}")
+    return "\n".join(lines)
+
+
+def page_fingerprint(text: str) -> str:
+    """Hash of the page text a job record was built from."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class JobRecordStore:
+    """
+    Structured job records stored on disk as one JSON file per normalized URL.
+
+    Each record keeps a fingerprint of the page text it was built from and is only
+    returned for that same text, so a changed posting is extracted again.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Directory holding the record files, created on the
+                first put
+        """
+        self.directory = directory
+
+    def path(self, url: str) -> str:
+        """Return the file path for a job URL's record."""
+        key = hashlib.sha256(normalize_url(url).encode()).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, url: str, text: str) -> Optional[dict]:
+        """Return the stored record for url if it was built from text, or None."""
+        try:
+            with open(self.path(url), "r") as file:
+                data = json.load(file)
+            if data.get("fingerprint") != page_fingerprint(text):
+                return None
+            return data["record"]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable job record for {url}: {str(e)}")
+            return None
+
+    def put(self, url: str, record: dict, text: str):
+        """Store the record built from text for url, replacing any previous one."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(url)
+        temp_path = f"{path}.tmp"
+        data = {
+            "url": normalize_url(url),
+            "fingerprint": page_fingerprint(text),
+            "record": record,
+        }
+        with open(temp_path, "w") as file:
+            json.dump(data, file, indent=2)
+        os.replace(temp_path, path)
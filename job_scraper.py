@@ -1,20 +1,162 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import Optional
+import asyncio
+import importlib.util
+import os
+import time
+from typing import TYPE_CHECKING, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import html_extractor
+from config import (
+    CACHE_DIR,
+    HTML_EXTRACTOR,
+    JOB_EXTRACTION_ENABLED,
+    JOB_RECORDS_DIR,
+    PAGE_CACHE_ENABLED,
+    PAGE_CACHE_MAX_BYTES,
+    PAGE_CACHE_TTL,
+    SCRAPE_DOMAIN_DELAY,
+    SCRAPE_HTTP2,
+    SCRAPE_MAX_CONNECTIONS,
+    SCRAPE_MAX_PER_HOST,
+    SCRAPE_TIMEOUT,
+    STRUCTURED_EXTRACTION_ENABLED,
+)
+from job_records import JobRecordStore, format_job_record
+from job_structured_data import extract_job_record
 from logger import logger
+from metrics import metrics
+from page_cache import PageCache
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class _HostPolicy:
+    """Per-host concurrency limit and spacing between request starts."""
+
+    def __init__(self, max_concurrent: int):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.lock = asyncio.Lock()
+        self.next_request = 0.0
 
 
 class JobScraper:
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[PageCache] = None,
+        max_connections: int = SCRAPE_MAX_CONNECTIONS,
+        max_per_host: int = SCRAPE_MAX_PER_HOST,
+        domain_delay: float = SCRAPE_DOMAIN_DELAY,
+        extractor: str = HTML_EXTRACTOR,
+        structured: bool = STRUCTURED_EXTRACTION_ENABLED,
+    ):
+        """
+        Args:
+            cache (Optional[PageCache]): Page cache to use; pass False to disable caching
+            max_connections (int): Size of the HTTP connection pool
+            max_per_host (int): Concurrent requests to one host in scrape_many
+            domain_delay (float): Seconds between request starts to one host in scrape_many
+            extractor (str): HTML extraction backend ("auto", "lxml", "stream" or "bs4")
+            structured (bool): Read JSON-LD / ATS markup into a job record before
+                falling back to the page text
+        """
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
         }
+        if cache is None and PAGE_CACHE_ENABLED:
+            cache = PageCache(
+                os.path.join(CACHE_DIR, "pages.sqlite3"),
+                ttl=PAGE_CACHE_TTL,
+                max_bytes=PAGE_CACHE_MAX_BYTES,
+            )
+        self.cache = cache
+        self.max_connections = max_connections
+        self.max_per_host = max(1, max_per_host)
+        self.domain_delay = domain_delay
+        self.extractor = html_extractor.resolve_backend(extractor)
+        self.structured = structured
+        # Records found in structured data are stored where EmailGenerator.extract_job looks
+        self.job_records = (
+            JobRecordStore(JOB_RECORDS_DIR)
+            if structured and JOB_EXTRACTION_ENABLED
+            else None
+        )
+        self._client = None
+
+    def _client_options(self) -> dict:
+        import httpx
+
+        # HTTP/2 multiplexes requests to a host over one connection, but needs h2
+        http2 = SCRAPE_HTTP2 and importlib.util.find_spec("h2") is not None
+        return {
+            "headers": self.headers,
+            "http2": http2,
+            "follow_redirects": True,
+            "timeout": SCRAPE_TIMEOUT,
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        }
+
+    @property
+    def client(self) -> "httpx.Client":
+        """Keep-alive HTTP client shared by all scrapes, created on first use."""
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.Client(**self._client_options())
+        return self._client
 
+    def close(self):
+        """Close pooled connections."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _cached_entry(self, url: str) -> Optional[dict]:
+        return self.cache.get(url) if self.cache else None
+
+    def _request_headers(self, entry: Optional[dict]) -> dict:
+        return self.cache.conditional_headers(entry) if entry else {}
+
+    def _handle_response(self, url: str, response, entry: Optional[dict]) -> str:
+        """Turn a (possibly 304) response into page text, updating the cache."""
+        if entry and response.status_code == 304:
+            logger.info("Cached job page content is still valid")
+            return self.cache.revalidated(url, entry)["text"]
+
+        response.raise_for_status()
+
+        if entry and entry["content_hash"] == PageCache.content_hash(response.text):
+            # Same page body as before, so the extracted text is still valid
+            page_text = entry["text"]
+        else:
+            page_text = self.extract_page(url, response.text)
+
+        if self.cache:
+            self.cache.put(
+                url,
+                response.text,
+                page_text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+        return page_text
+
+    @metrics.timed("scrape")
     def scrape_job_description(self, url: str) -> Optional[str]:
         """
         Scrape job description from the given URL.
 
+        Pages are served from the on-disk cache while fresh and revalidated with
+        ETag/Last-Modified once stale, so re-runs skip the network and the parse.
+        Requests go through a pooled keep-alive client, so consecutive postings on
+        the same host reuse the connection. Pages with JSON-LD or known ATS markup
+        return the compact structured job record as text (see extract_page).
+
         Args:
             url (str): The URL of the job posting
 
@@ -22,43 +164,112 @@ class JobScraper:
             Optional[str]: The scraped job description or None if scraping fails
         """
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
+            entry = self._cached_entry(url)
+            if entry and self.cache.is_fresh(entry):
+                logger.info("Using cached job page content")
+                metrics.inc("page_cache_hits")
+                return entry["text"]
+
+            response = self.client.get(url, headers=self._request_headers(entry))
+            return self._handle_response(url, response, entry)
+
+        except Exception as e:
+            logger.error(f"Error scraping job description: {str(e)}")
+            metrics.inc("scrape_failures")
+            return None
 
-            soup = BeautifulSoup(response.text, "html.parser")
+    def scrape_many(self, urls: Iterable[str]) -> List[Optional[str]]:
+        """
+        Scrape many job pages concurrently.
 
-            # Remove unnecessary elements that might contain irrelevant text
-            for element in soup(
-                ["script", "style", "nav", "header", "footer", "iframe", "meta"]
-            ):
-                element.extract()
+        Hosts are scraped in parallel, while requests to the same host (e.g. one ATS
+        like Greenhouse or Lever) share pooled connections, are limited to
+        max_per_host at a time and start at least domain_delay seconds apart.
 
-            # Get the main content
-            main_content = (
-                soup.find("main") or soup.find("article") or soup.find("body")
-            )
+        Args:
+            urls (Iterable[str]): URLs of the job postings
+
+        Returns:
+            List[Optional[str]]: Page text per URL in input order, None where scraping failed
+        """
+        return asyncio.run(self._scrape_many(list(urls)))
+
+    async def _scrape_many(self, urls: List[str]) -> List[Optional[str]]:
+        import httpx
 
-            if main_content:
-                # Extract text with better formatting
-                lines = []
+        hosts = {}
+        async with httpx.AsyncClient(**self._client_options()) as client:
+            return await asyncio.gather(
+                *(self._ascrape(client, url, hosts) for url in urls)
+            )
 
-                # Get all text elements
-                for element in main_content.stripped_strings:
-                    line = element.strip()
-                    if line:  # Only add non-empty lines
-                        lines.append(line)
+    async def _ascrape(
+        self, client: "httpx.AsyncClient", url: str, hosts: dict
+    ) -> Optional[str]:
+        try:
+            entry = self._cached_entry(url)
+            if entry and self.cache.is_fresh(entry):
+                return entry["text"]
 
-                # Join all lines with proper spacing
-                page_text = "\n".join(lines)
+            host = urlsplit(url).netloc.lower()
+            policy = hosts.setdefault(host, _HostPolicy(self.max_per_host))
+            async with policy.semaphore:
+                async with policy.lock:
+                    wait = policy.next_request - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    policy.next_request = time.monotonic() + self.domain_delay
+                logger.info(f"Scraping {url}")
+                with metrics.timer("scrape"):
+                    response = await client.get(
+                        url, headers=self._request_headers(entry)
+                    )
 
-                return page_text
-            else:
-                # Fallback: get all text from the page
-                return soup.get_text(separator="\n", strip=True)
+            return self._handle_response(url, response, entry)
 
         except Exception as e:
-            logger.error(f"Error scraping job description: {str(e)}")
+            logger.error(f"Error scraping {url}: {str(e)}")
+            metrics.inc("scrape_failures")
             return None
 
+    def extract_page(self, url: str, html: str) -> str:
+        """
+        Extract the job description text from a fetched page.
+
+        When the page carries a schema.org JobPosting or known ATS markup, the
+        structured job record is stored for EmailGenerator.extract_job and returned
+        as compact text, so neither the text extraction nor the LLM extraction
+        step has to run. Other pages fall back to extract_text.
+
+        Args:
+            url (str): URL of the job posting
+            html (str): Raw HTML of the page
+
+        Returns:
+            str: The job description text
+        """
+        if self.structured:
+            record = extract_job_record(html, url)
+            if record:
+                logger.info("Using structured job data from the page")
+                metrics.inc("structured_extractions")
+                text = format_job_record(record)
+                if self.job_records:
+                    self.job_records.put(url, record, text)
+                return text
+        return self.extract_text(html)
+
+    def extract_text(self, html: str) -> str:
+        """
+        Extract the readable text from a job page.
+
+        Args:
+            html (str): Raw HTML of the page
+
+        Returns:
+            str: The page text, one line per text element
+        """
+        return html_extractor.extract_text(html, self.extractor)
+
 
 # One issue I already see here is if the header dosent match Job Description title, then it will not be able to scrape the job description.
@@ -0,0 +1,315 @@
+import json
+import re
+from html import unescape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import html_extractor
+from job_records import normalize_job_record
+from logger import logger
+
+# Elements without an end tag, which must not change the nesting depth
+VOID_TAGS = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "link",
+    "meta",
+    "source",
+    "track",
+    "wbr",
+}
+
+# Markup of known applicant tracking systems: host suffix -> field -> (attribute, value)
+ATS_SELECTORS: Dict[str, Dict[str, Tuple[str, str]]] = {
+    # boards.greenhouse.io
+    "greenhouse.io": {
+        "title": ("class", "app-title"),
+        "company": ("class", "company-name"),
+        "location": ("class", "location"),
+        "description": ("id", "content"),
+    },
+    # jobs.lever.co
+    "lever.co": {
+        "title": ("class", "posting-headline"),
+        "location": ("class", "location"),
+        "description": ("class", "section"),
+    },
+    # *.myworkdayjobs.com renders in the browser; its server HTML carries og: tags
+    "myworkdayjobs.com": {},
+}
+
+# Description headings that start a section of the job record, matched in order
+SECTION_HEADINGS = (
+    ("preferred_qualifications", re.compile(r"prefer|nice to have|bonus", re.I)),
+    (
+        "required_qualifications",
+        re.compile(
+            r"requirement|qualification|what you.?ll (bring|need)|you have|"
+            r"must have|skills|about you|who you are",
+            re.I,
+        ),
+    ),
+    (
+        "responsibilities",
+        re.compile(r"responsibilit|what you.?ll do|the role|your role|duties", re.I),
+    ),
+)
+MAX_HEADING_WORDS = 5
+
+_LD_JSON = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script>",
+    re.I | re.S,
+)
+
+
+class _MarkupScanner(HTMLParser):
+    """Collects meta tags and the text lines of elements matching ATS selectors."""
+
+    def __init__(self, selectors: Dict[str, Tuple[str, str]]):
+        super().__init__(convert_charrefs=True)
+        self.selectors = selectors
+        self.meta: Dict[str, str] = {}
+        self.fields: Dict[str, List[str]] = {}
+        self._open: List[list] = []  # [field, depth] of matched elements
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta":
+            key = attrs.get("property") or attrs.get("name")
+            if key and attrs.get("content"):
+                self.meta.setdefault(key.lower(), attrs["content"])
+            return
+        if tag in ("script", "style"):
+            self._skip += 1
+            return
+        if tag in VOID_TAGS:
+            return
+        for matched in self._open:
+            matched[1] += 1
+        open_fields = {field for field, _ in self._open}
+        for field, (attribute, value) in self.selectors.items():
+            # A field may span several elements (e.g. one per description section)
+            if (
+                field not in open_fields
+                and value in (attrs.get(attribute) or "").split()
+            ):
+                self.fields.setdefault(field, [])
+                self._open.append([field, 1])
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style"):
+            self._skip = max(0, self._skip - 1)
+            return
+        if tag in VOID_TAGS:
+            return
+        for matched in self._open:
+            matched[1] -= 1
+        self._open = [matched for matched in self._open if matched[1] > 0]
+
+    def handle_data(self, data):
+        if self._skip or not self._open:
+            return
+        line = data.strip()
+        if line:
+            for field, _ in self._open:
+                self.fields[field].append(line)
+
+
+def _json_ld_objects(html: str) -> List[dict]:
+    """Every JSON-LD object on the page, with @graph containers flattened."""
+    objects = []
+    for match in _LD_JSON.finditer(html):
+        try:
+            data = json.loads(match.group(1).strip())
+        except ValueError:
+            continue
+        pending = data if isinstance(data, list) else [data]
+        while pending:
+            item = pending.pop(0)
+            if isinstance(item, dict):
+                objects.append(item)
+                pending.extend(item.get("@graph") or [])
+            elif isinstance(item, list):
+                pending.extend(item)
+    return objects
+
+
+def _is_job_posting(item: dict) -> bool:
+    types = item.get("@type")
+    types = types if isinstance(types, list) else [types]
+    return "JobPosting" in types
+
+
+def _name(value) -> Optional[str]:
+    """The name of a schema.org thing given inline or as a plain string."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("name")
+    return unescape(str(value)).strip() if value else None
+
+
+def _location(value) -> Optional[str]:
+    """Readable location from one or more schema.org Place objects."""
+    places = value if isinstance(value, list) else [value]
+    names = []
+    for place in places:
+        if not isinstance(place, dict):
+            continue
+        address = place.get("address") or {}
+        if isinstance(address, dict):
+            parts = [
+                address.get(key)
+                for key in ("addressLocality", "addressRegion", "addressCountry")
+            ]
+            parts = [_name(part) for part in parts if part]
+            if parts:
+                names.append(", ".join(parts))
+        elif address:
+            names.append(str(address))
+    return "; ".join(dict.fromkeys(names)) or None
+
+
+def _text_lines(value) -> List[str]:
+    """Lines of text from a schema.org text value that may hold HTML."""
+    if isinstance(value, list):
+        return [line for item in value for line in _text_lines(item)]
+    if isinstance(value, dict):
+        value = value.get("description") or value.get("name")
+    if not value:
+        return []
+    text = str(value)
+    if "<" in text:
+        text = html_extractor.extract_text(text)
+    return [line.strip() for line in unescape(text).splitlines() if line.strip()]
+
+
+def split_sections(lines: List[str]) -> Dict[str, List[str]]:
+    """
+    Split description lines into job record sections by their headings.
+
+    Headings are short lines naming a section ("Requirements", "What you'll
+    do:"); lines before the first recognized heading go to other_details.
+    """
+    sections = {field: [] for field, _ in SECTION_HEADINGS}
+    sections["other_details"] = []
+    current = "other_details"
+    for line in lines:
+        if (
+            len(line.split()) <= MAX_HEADING_WORDS
+            and "." not in line
+            and not line[0].isdigit()
+        ):
+            heading = next(
+                (field for field, pattern in SECTION_HEADINGS if pattern.search(line)),
+                None,
+            )
+            if heading:
+                current = heading
+                continue
+        sections[current].append(line.lstrip("•-*· ").strip())
+    return sections
+
+
+def _record_from_json_ld(posting: dict) -> dict:
+    sections = split_sections(_text_lines(posting.get("description")))
+    sections["responsibilities"] += _text_lines(posting.get("responsibilities"))
+    for key in (
+        "qualifications",
+        "experienceRequirements",
+        "educationRequirements",
+        "skills",
+    ):
+        sections["required_qualifications"] += _text_lines(posting.get(key))
+    return normalize_job_record(
+        {
+            "title": _name(posting.get("title")),
+            "company": _name(posting.get("hiringOrganization")),
+            "location": _location(posting.get("jobLocation"))
+            or _name(posting.get("jobLocationType")),
+            **sections,
+        }
+    )
+
+
+def _record_from_markup(html: str, selectors: Dict[str, Tuple[str, str]]) -> dict:
+    scanner = _MarkupScanner(selectors)
+    scanner.feed(html)
+    scanner.close()
+    fields, meta = scanner.fields, scanner.meta
+
+    description = fields.get("description") or _text_lines(
+        meta.get("og:description") or meta.get("description")
+    )
+    title = " ".join(fields.get("title", [])[:1]) or meta.get("og:title")
+    company = " ".join(fields.get("company", [])) or meta.get("og:site_name")
+    location = " ".join(fields.get("location", [])[:1])
+    return normalize_job_record(
+        {
+            "title": title,
+            "company": company.removeprefix("at ").strip() if company else None,
+            "location": location,
+            **split_sections(description),
+        }
+    )
+
+
+def ats_selectors(url: str) -> Optional[Dict[str, Tuple[str, str]]]:
+    """Markup selectors for the applicant tracking system hosting url, if known."""
+    host = (urlsplit(url).hostname or "").lower()
+    for suffix, selectors in ATS_SELECTORS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return selectors
+    return None
+
+
+def extract_job_record(html: str, url: str = "") -> Optional[dict]:
+    """
+    Build a structured job record from the page's structured data.
+
+    Looks for a schema.org JobPosting in the page's JSON-LD first, then for the
+    markup of known applicant tracking systems (Greenhouse, Lever, Workday).
+    Pages without JSON-LD from other hosts are rejected by a substring check,
+    without being parsed.
+
+    Args:
+        html (str): Raw HTML of the page
+        url (str): URL of the page, used to recognize the tracking system
+
+    Returns:
+        Optional[dict]: A normalized job record, or None if the page has no usable
+            structured data
+    """
+    try:
+        if "ld+json" in html:
+            for item in _json_ld_objects(html):
+                if _is_job_posting(item):
+                    record = _record_from_json_ld(item)
+                    if record["title"]:
+                        return record
+
+        selectors = ats_selectors(url) if url else None
+        if selectors is not None:
+            record = _record_from_markup(html, selectors)
+            if record["title"] and any(
+                record[field]
+                for field in (
+                    "responsibilities",
+                    "required_qualifications",
+                    "preferred_qualifications",
+                    "other_details",
+                )
+            ):
+                return record
+
+    except Exception as e:
+        logger.warning(f"Structured job data extraction failed: {str(e)}")
+    return None
@@ -0,0 +1,148 @@
+import re
+from typing import List
+
+# Section headings and how much their contents matter for writing the email
+SECTION_WEIGHTS = [
+    (re.compile(r"responsibilit|what you('ll| will) do|the role|day to day"), 4),
+    (
+        re.compile(
+            r"qualifications|requirements|what you('ll)? (need|bring)|must have"
+        ),
+        4,
+    ),
+    (re.compile(r"preferred|nice to have|bonus|plus"), 3),
+    (re.compile(r"skills|experience|about (the|this) (job|position|team)"), 3),
+    (re.compile(r"job description|overview|summary"), 2),
+    (re.compile(r"about (us|the company)|who we are|our mission"), 1),
+    (re.compile(r"benefits|perks|compensation|salary|pay range"), 0),
+    (
+        re.compile(r"equal (employment )?opportunity|eeo|accommodation|privacy|cookie"),
+        -4,
+    ),
+]
+
+SIGNAL_PATTERN = re.compile(
+    r"\b(experience|years?|degree|proficien\w*|knowledge|familiar\w*|ability|"
+    r"design\w*|develop\w*|build\w*|own\w*|lead\w*|collaborat\w*|responsib\w*|"
+    r"required|preferred|skills?|engineer\w*|manag\w*|stakeholders?|deliver\w*)\b",
+    re.IGNORECASE,
+)
+
+BOILERPLATE_PATTERN = re.compile(
+    r"cookie|privacy policy|terms of (use|service)|sign in|log in|sign up|"
+    r"apply now|share this|follow us|all rights reserved|©|javascript|"
+    r"similar jobs|back to (jobs|search)|skip to",
+    re.IGNORECASE,
+)
+
+# Leading lines usually carry the job title, company and location
+HEADER_LINES = 5
+
+
+def count_tokens(text: str) -> int:
+    """Count prompt tokens with tiktoken if installed, else estimate ~4 chars/token."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+_tiktoken_encoding = None
+_tiktoken_checked = False
+
+
+def _encoding():
+    """Load the tiktoken encoding on first use; None if tiktoken isn't installed."""
+    global _tiktoken_encoding, _tiktoken_checked
+    if not _tiktoken_checked:
+        _tiktoken_checked = True
+        try:
+            import tiktoken
+
+            _tiktoken_encoding = tiktoken.get_encoding("cl100k_base")
+        except ImportError:  # optional, falls back to a character-based estimate
+            pass
+    return _tiktoken_encoding
+
+
+def _section_weight(line: str):
+    """Return the weight of a section heading, or None if the line isn't a heading."""
+    words = line.split()
+    if not words or len(words) > 8 or line.endswith("."):
+        return None
+    lowered = line.lower()
+    for pattern, weight in SECTION_WEIGHTS:
+        if pattern.search(lowered):
+            return weight
+    return None
+
+
+def score_lines(lines: List[str]) -> List[float]:
+    """Score each scraped line for how much job-description signal it carries."""
+    scores = []
+    section = 0
+    for index, line in enumerate(lines):
+        heading = _section_weight(line)
+        if heading is not None:
+            section = heading
+            # Keep useful headings so the condensed text still reads in sections
+            scores.append(heading + 1 if heading > 0 else -5)
+            continue
+
+        words = len(line.split())
+        score = float(section)
+        score += min(len(SIGNAL_PATTERN.findall(line)), 3)
+        score += min(words / 10, 2)
+        if words < 3:
+            score -= 2
+        elif words < 5:
+            score -= 1
+        if BOILERPLATE_PATTERN.search(line):
+            score -= 6
+        if index < HEADER_LINES:
+            score += 3
+        scores.append(score)
+    return scores
+
+
+def condense_job_text(job_page_text: str, token_budget: int) -> str:
+    """
+    Condense scraped job page text to its most relevant lines within a token budget.
+
+    Lines are scored for job-description signal (section they sit under, keywords,
+    length, boilerplate) and the best ones are kept in their original order until
+    the budget is used up. Text that already fits is returned unchanged.
+
+    Args:
+        job_page_text (str): Text produced by JobScraper, one element per line
+        token_budget (int): Maximum prompt tokens to spend on the job text
+
+    Returns:
+        str: The condensed job text
+    """
+    if count_tokens(job_page_text) <= token_budget:
+        return job_page_text
+
+    lines = []
+    seen = set()
+    for line in job_page_text.split("\n"):
+        line = line.strip()
+        if line and line not in seen:
+            seen.add(line)
+            lines.append(line)
+
+    scores = score_lines(lines)
+    ranked = sorted(range(len(lines)), key=lambda index: scores[index], reverse=True)
+
+    selected = set()
+    used = 0
+    for index in ranked:
+        if scores[index] <= 0:
+            break
+        cost = count_tokens(lines[index]) + 1  # +1 for the joining newline
+        if used + cost > token_budget:
+            continue
+        selected.add(index)
+        used += cost
+
+    return "\n".join(lines[index] for index in sorted(selected))
@@ -1,22 +1,41 @@
+import argparse
+import json
 import os
+import sys
+from typing import Iterable, Optional
 
-import pandas as pd
-
-from config import DATASET_PATH, RESUME_PATH, TEMPLATE_PATH
+from campaign_journal import CampaignJournal
+from config import (
+    CAMPAIGN_JOURNAL_PATH,
+    DATASET_PATH,
+    GMAIL_TOKEN_PATH,
+    RESUME_PATH,
+    SEND_USE_BATCH,
+    SUPPRESSION_ENABLED,
+    SUPPRESSION_PATH,
+    SUPPRESSION_RECONTACT_DAYS,
+    TEMPLATE_PATH,
+)
 from email_generator import EmailGenerator
 from email_sender import EmailSender
 from job_scraper import JobScraper
 from logger import logger
+from metrics import metrics
+from pipeline import BatchPipeline, load_job_urls, summarize
+from recipient_loader import RecipientLoader
+from speculation import Speculation
+from suppression import SuppressionIndex, load_addresses
 
 
-def load_email_dataset(file_path: str) -> list:
-    """Load email addresses from dataset file."""
-    try:
-        df = pd.read_csv(file_path)
-        return df["email"].tolist()  # Assuming the column name is 'email'
-    except Exception as e:
-        logger.error(f"Error loading email dataset: {str(e)}")
-        return []
+def load_email_dataset(file_path: str) -> Optional[RecipientLoader]:
+    """
+    Open the recipient dataset for streaming.
+
+    Rows are read lazily while sending, validated and deduplicated on the fly.
+    Returns None if the file can't be read or has no 'email' column.
+    """
+    loader = RecipientLoader(file_path)  # Assuming the column name is 'email'
+    return loader if loader.validate() else None
 
 
 def load_template(file_path: str) -> str:
@@ -45,7 +64,288 @@ def check_files_exist():
     return missing_files
 
 
+def show_subject(subject: str):
+    """Display the generated email subject."""
+    logger.info("\nGenerated email subject:")
+    logger.info("-" * 50)
+    logger.info(subject)
+    logger.info("-" * 50)
+
+
+def generate_streaming(
+    email_generator: EmailGenerator,
+    template: str,
+    job_page_text: str,
+    resume_text: str,
+    job_url: str,
+    job_record: dict = None,
+) -> tuple:
+    """Generate the email while showing the subject and content as they stream in."""
+
+    def on_subject(subject: str):
+        show_subject(subject)
+        logger.info("\nGenerated email content:")
+        logger.info("-" * 50)
+
+    def on_content(text: str):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    email_content, email_subject = email_generator.generate_email_stream(
+        template,
+        job_page_text,
+        resume_text,
+        job_url,
+        job_record=job_record,
+        on_subject=on_subject,
+        on_content=on_content,
+    )
+    sys.stdout.write("\n")
+    logger.info("-" * 50)
+    return email_content, email_subject
+
+
+def prepare_email(
+    email_generator: EmailGenerator,
+    job_page_text: str,
+    job_url: str,
+    stream: bool = False,
+) -> tuple:
+    """
+    Load the template and resume, extract the job details and generate the email.
+
+    Returns:
+        tuple: (email_content, email_subject), (None, None) on failure
+    """
+    # Load email template
+    logger.info("\nLoading email template...")
+    template = load_template(TEMPLATE_PATH)
+    if not template:
+        logger.error("Failed to load email template.")
+        return None, None
+
+    # Extract resume text
+    logger.info("Extracting resume text...")
+    resume_text = email_generator.extract_resume_text(RESUME_PATH)
+    if not resume_text:
+        logger.error("Failed to extract resume text.")
+        return None, None
+
+    # Extract the structured job record (reused across regenerations)
+    logger.info("Extracting job details...")
+    job_record = email_generator.extract_job(job_page_text, job_url)
+
+    # Generate email content and subject
+    logger.info("Generating email content and subject...")
+    if stream:
+        return generate_streaming(
+            email_generator, template, job_page_text, resume_text, job_url, job_record
+        )
+    return email_generator.generate_email(
+        template, job_page_text, resume_text, job_url, job_record=job_record
+    )
+
+
+def authenticate_if_possible(email_sender: EmailSender):
+    """
+    Authenticate from a saved token without ever opening the browser login.
+
+    A first-time login, or one needed because the saved token can't be
+    refreshed, is left to the send path in the foreground.
+    """
+    if os.path.exists(GMAIL_TOKEN_PATH):
+        email_sender.authenticate(interactive=False)
+
+
+def start_speculation(
+    email_generator: EmailGenerator,
+    email_sender: EmailSender,
+    job_page_text: str,
+    job_url: str,
+) -> Speculation:
+    """
+    Start generation, recipient loading and Gmail authentication in the background.
+
+    Runs while the operator reviews the scraped page, so by the time they confirm
+    the email is usually ready.
+    """
+    speculation = Speculation()
+    speculation.start(
+        "email generation", prepare_email, email_generator, job_page_text, job_url
+    )
+    speculation.start("recipient loading", load_email_dataset, DATASET_PATH)
+    speculation.start("Gmail authentication", authenticate_if_possible, email_sender)
+    return speculation
+
+
+def send_campaign(
+    email_sender: EmailSender, recipients: Iterable, subject: str, content: str
+) -> dict:
+    """
+    Send the generated email to all recipients using the configured send path.
+
+    Progress is journaled per campaign, so re-running after a crash skips the
+    recipients that were already sent. Duplicate, suppressed and recently
+    contacted addresses are skipped through the suppression index.
+    """
+    campaign_id = CampaignJournal.campaign_key(subject, content)
+    with CampaignJournal(CAMPAIGN_JOURNAL_PATH, campaign_id) as journal:
+        suppression = (
+            SuppressionIndex(
+                SUPPRESSION_PATH,
+                campaign_id,
+                recontact_days=SUPPRESSION_RECONTACT_DAYS,
+            )
+            if SUPPRESSION_ENABLED
+            else None
+        )
+        try:
+            if SEND_USE_BATCH:
+                return email_sender.send_bulk_emails_batched(
+                    recipients,
+                    subject,
+                    content,
+                    journal=journal,
+                    suppression=suppression,
+                )
+            return email_sender.send_bulk_emails(
+                recipients, subject, content, journal=journal, suppression=suppression
+            )
+        finally:
+            if suppression:
+                suppression.close()
+
+
+def suppress_addresses(file_path: str, reason: str):
+    """Add the addresses in a file to the suppression list."""
+    with SuppressionIndex(SUPPRESSION_PATH) as suppression:
+        count = suppression.suppress(load_addresses(file_path), reason)
+    logger.info(f"Suppressed {count} addresses ({reason})")
+
+
+def run_batch(urls_path: str, report_path: str = None, regenerate: bool = False):
+    """Process a file of job URLs without prompts, overlapping the pipeline stages."""
+    job_urls = load_job_urls(urls_path)
+    if not job_urls:
+        logger.error("No job URLs found. Exiting...")
+        return
+
+    template = load_template(TEMPLATE_PATH)
+    if not template:
+        logger.error("Failed to load email template. Exiting...")
+        return
+
+    job_scraper = JobScraper()
+    email_generator = EmailGenerator(regenerate=regenerate)
+    email_sender = EmailSender()
+
+    resume_text = email_generator.extract_resume_text(RESUME_PATH)
+    if not resume_text:
+        logger.error("Failed to extract resume text. Exiting...")
+        return
+
+    recipients = load_email_dataset(DATASET_PATH)
+    if not recipients:
+        logger.error("No recipients found in dataset. Exiting...")
+        return
+
+    logger.info(f"Processing {len(job_urls)} job postings")
+
+    def generate(job_url: str, page_text: str) -> tuple:
+        job_record = email_generator.extract_job(page_text, job_url)
+        return email_generator.generate_email(
+            template, page_text, resume_text, job_url, job_record=job_record
+        )
+
+    pipeline = BatchPipeline(
+        scrape=job_scraper.scrape_job_description,
+        generate=generate,
+        send=lambda subject, content: send_campaign(
+            email_sender, recipients, subject, content
+        ),
+    )
+    reports = pipeline.run(job_urls)
+    summarize(reports)
+    if email_generator.cache:
+        logger.info(
+            f"Generation cache: {email_generator.cache.hits} hits, "
+            f"{email_generator.cache.misses} misses"
+        )
+
+    if report_path:
+        with open(report_path, "w") as file:
+            json.dump(reports, file, indent=2)
+        logger.info(f"Report written to {report_path}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="AIRA - AI Reachout Assistant")
+    parser.add_argument(
+        "--batch",
+        metavar="URLS_FILE",
+        help="Run non-interactively over a file of job URLs (one per line)",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="REPORT_FILE",
+        help="Write the batch summary report as JSON to this file",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Show the generated email as it streams in from the model",
+    )
+    parser.add_argument(
+        "--regenerate",
+        action="store_true",
+        help="Ask the model for a new email instead of reusing a cached one "
+        "(the new email replaces the cached one)",
+    )
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        help="Generate the email, load recipients and authenticate with Gmail in the "
+        "background while you review the scraped page (the email is not streamed)",
+    )
+    parser.add_argument(
+        "--suppress",
+        metavar="ADDRESSES_FILE",
+        help="Add the addresses in this file (one per line) to the suppression list "
+        "and exit",
+    )
+    parser.add_argument(
+        "--reason",
+        default="unsubscribed",
+        help="Suppression reason recorded with --suppress (default: unsubscribed)",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="METRICS_FILE",
+        help="Record per-stage timings and token usage and write them to this file "
+        "(Prometheus text for .prom/.txt, JSON otherwise)",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    if args.metrics:
+        metrics.enabled = True
+    try:
+        run(args)
+    finally:
+        if args.metrics:
+            metrics.write(args.metrics)
+            logger.info(f"Metrics written to {args.metrics}")
+
+
+def run(args: argparse.Namespace):
+    """Run the interactive flow, or batch mode when --batch is given."""
+    if args.suppress:
+        suppress_addresses(args.suppress, args.reason)
+        return
+
     # Check if all required files exist
     missing_files = check_files_exist()
     if missing_files:
@@ -55,9 +355,13 @@ def main():
         logger.error("\nPlease create these files and try again.")
         return
 
+    if args.batch:
+        run_batch(args.batch, args.report, regenerate=args.regenerate)
+        return
+
     # Initialize components
     job_scraper = JobScraper()
-    email_generator = EmailGenerator()
+    email_generator = EmailGenerator(regenerate=args.regenerate)
     email_sender = EmailSender()
 
     # Get job description URL from user
@@ -78,69 +382,71 @@ def main():
     )
     logger.info("-" * 50)
 
+    speculation = None
+    if args.speculative:
+        speculation = start_speculation(
+            email_generator, email_sender, job_page_text, job_url
+        )
+
     # Confirm with user
     proceed = input("\nDo you want to proceed with this job page content? (y/n): ")
     if proceed.lower() not in ["y", "yes"]:
+        if speculation:
+            speculation.cancel()
         logger.info("Operation cancelled by user.")
         return
 
-    # Load email template
-    logger.info("\nLoading email template...")
-    template = load_template(TEMPLATE_PATH)
-    if not template:
-        logger.error("Failed to load email template. Exiting...")
-        return
-
-    # Extract resume text
-    logger.info("Extracting resume text...")
-    resume_text = email_generator.extract_resume_text(RESUME_PATH)
-    if not resume_text:
-        logger.error("Failed to extract resume text. Exiting...")
-        return
-
-    # Generate email content and subject
-    logger.info("Generating email content and subject...")
-    email_content, email_subject = email_generator.generate_email(
-        template, job_page_text, resume_text, job_url
-    )
+    if speculation:
+        email_content, email_subject = speculation.result("email generation")
+    else:
+        email_content, email_subject = prepare_email(
+            email_generator, job_page_text, job_url, stream=args.stream
+        )
     if not email_content or not email_subject:
         logger.error("Failed to generate email content or subject. Exiting...")
         return
 
-    logger.info("\nGenerated email subject:")
-    logger.info("-" * 50)
-    logger.info(email_subject)
-    logger.info("-" * 50)
-
-    logger.info("\nGenerated email content:")
-    logger.info("-" * 50)
-    logger.info(email_content)
-    logger.info("-" * 50)
+    if speculation or not args.stream:
+        show_subject(email_subject)
+        logger.info("\nGenerated email content:")
+        logger.info("-" * 50)
+        logger.info(email_content)
+        logger.info("-" * 50)
 
     # Confirm with user
     proceed = input("\nDo you want to proceed with sending this email? (y/n): ")
     if proceed.lower() not in ["y", "yes"]:
+        if speculation:
+            speculation.cancel()
         logger.info("Operation cancelled by user.")
         return
 
     # Load recipient emails
     logger.info("\nLoading recipient emails...")
-    recipients = load_email_dataset(DATASET_PATH)
+    if speculation:
+        recipients = speculation.result("recipient loading")
+        try:
+            speculation.result("Gmail authentication")
+        except Exception as e:
+            # The send path authenticates again on its own
+            logger.warning(f"Background Gmail authentication failed: {str(e)}")
+    else:
+        recipients = load_email_dataset(DATASET_PATH)
     if not recipients:
         logger.error("No recipients found in dataset. Exiting...")
         return
 
-    logger.info(f"Found {len(recipients)} recipients in the dataset.")
-
     # Send emails
     logger.info("\nSending emails...")
-    stats = email_sender.send_bulk_emails(recipients, email_subject, email_content)
+    stats = send_campaign(email_sender, recipients, email_subject, email_content)
 
     # Print results
     logger.info("\nEmail sending completed!")
     logger.info(f"Total emails: {stats['total']}")
     logger.info(f"Successfully sent: {stats['successful']}")
     logger.info(f"Failed to send: {stats['failed']}")
+    logger.info(f"Skipped (already sent): {stats['skipped']}")
+    logger.info(f"Skipped (suppressed or duplicate): {stats['suppressed']}")
 
 
 if __name__ == "__main__":
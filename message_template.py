@@ -0,0 +1,154 @@
+import base64
+import html
+import os
+import re
+import uuid
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from functools import lru_cache
+from typing import Dict, Optional
+
+from metrics import metrics
+from personalization import SlotTemplate, single_line
+
+MARKDOWN_LINK_PATTERN = re.compile(r"\[(.*?)\]\((.*?)\)")
+PLAIN_URL_PATTERN = re.compile(r'(?<!href=")(https?://\S+)(?!")')
+
+
+def render_html(message_text: str) -> str:
+    """Convert the plain-text/markdown email body into the HTML document we send."""
+    # Convert markdown-style links to HTML links
+    message_text = MARKDOWN_LINK_PATTERN.sub(
+        r'<a href="\2" style="color: #0366d6; text-decoration: none;">\1</a>',
+        message_text,
+    )
+
+    # Convert plain URLs to clickable links (if any remain)
+    message_text = PLAIN_URL_PATTERN.sub(
+        r'<a href="\1" style="color: #0366d6; text-decoration: none;">\1</a>',
+        message_text,
+    )
+
+    body = message_text.replace("\n\n", "</p><p>").replace("\n", "<br>")
+
+    return f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <style>
+                body {{
+                    font-family: Arial, sans-serif;
+                    line-height: 1.6;
+                    margin: 0;
+                    padding: 15px;
+                    max-width: 100%;
+                    color: #24292e;
+                }}
+                p {{
+                    margin-bottom: 1em;
+                    word-wrap: break-word;
+                }}
+                a {{
+                    color: #0366d6;
+                    text-decoration: none;
+                }}
+                a:hover {{
+                    text-decoration: underline;
+                }}
+                @media screen and (max-width: 600px) {{
+                    body {{
+                        padding: 10px;
+                    }}
+                }}
+            </style>
+        </head>
+        <body>
+            {body}
+        </body>
+        </html>
+        """
+
+
+@lru_cache(maxsize=4)
+def _encoded_attachment(path: str, mtime_ns: int, size: int) -> bytes:
+    """
+    Serialize the PDF attachment MIME part once per file version.
+
+    mtime_ns and size are only part of the cache key so an edited file is re-read.
+    """
+    with open(path, "rb") as pdf_file:
+        pdf_attachment = MIMEApplication(pdf_file.read(), _subtype="pdf")
+    pdf_attachment.add_header(
+        "Content-Disposition",
+        "attachment",
+        filename=os.path.basename(path),
+    )
+    return pdf_attachment.as_bytes()
+
+
+class MessageTemplate:
+    """
+    A campaign message rendered once and stamped out per recipient.
+
+    The HTML body is rendered a single time with its {{field}} slots (see
+    personalization.py) left in place, and the PDF attachment part is serialized and
+    base64url-encoded once. Rendering a recipient only fills the slots, builds the
+    small header/HTML part and appends the pre-encoded attachment.
+    """
+
+    def __init__(self, subject: str, message_text: str, pdf_path: Optional[str] = None):
+        """
+        Args:
+            subject (str): Email subject, optionally containing {{field}} slots
+            message_text (str): Email body, optionally containing {{field}} slots
+            pdf_path (Optional[str]): PDF to attach, skipped if missing
+        """
+        self.subject = subject
+        self.html = render_html(message_text)
+        self._subject_slots = SlotTemplate(subject)
+        self._html_slots = SlotTemplate(self.html)
+        self.boundary = f"==============={uuid.uuid4().hex}=="
+        self._closing = f"--{self.boundary}--\n".encode()
+        self._attachment_b64 = None
+
+        if pdf_path and os.path.exists(pdf_path):
+            stat = os.stat(pdf_path)
+            part = _encoded_attachment(pdf_path, stat.st_mtime_ns, stat.st_size)
+            tail = f"--{self.boundary}\n".encode() + part + b"\n" + self._closing
+            self._attachment_b64 = base64.urlsafe_b64encode(tail).decode()
+
+    @metrics.timed("render_message")
+    def render(self, to: str, values: Optional[Dict[str, str]] = None) -> dict:
+        """
+        Build the Gmail API message body for one recipient.
+
+        Args:
+            to (str): Recipient email address
+            values (Optional[Dict[str, str]]): Slot values for this recipient, e.g.
+                from personalization.recipient_fields
+
+        Returns:
+            dict: Message body with the base64url-encoded "raw" RFC 2822 message
+        """
+        # CSV values can carry line breaks, which must not reach a header
+        subject = self._subject_slots.render(values, escape=single_line)
+        html_content = self._html_slots.render(values, escape=html.escape)
+
+        # Create the root message as multipart
+        message = MIMEMultipart(boundary=self.boundary)
+        message["to"] = to
+        message["subject"] = subject
+        message.attach(MIMEText(html_content, "html"))
+
+        if self._attachment_b64 is None:
+            return {"raw": base64.urlsafe_b64encode(message.as_bytes()).decode()}
+
+        # Drop the closing boundary and splice in the pre-encoded attachment. Base64
+        # of a concatenation equals the concatenation of the encodings when the first
+        # chunk's length is a multiple of 3, so pad the HTML part with spaces to that.
+        head = message.as_bytes()[: -len(self._closing)]
+        head = head[:-1] + b" " * (-len(head) % 3) + b"\n"
+        return {"raw": base64.urlsafe_b64encode(head).decode() + self._attachment_b64}
@@ -0,0 +1,238 @@
+import bisect
+import functools
+import inspect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from config import METRICS_ENABLED
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+# Prefix of exported Prometheus metric names
+PROMETHEUS_PREFIX = "aira_"
+
+
+def usage_field(usage, field: str):
+    """
+    Read a field of an OpenAI usage object.
+
+    Fields the pinned SDK doesn't model, such as the usage on a streamed chunk or
+    prompt_tokens_details, come back as plain dicts, so both shapes are accepted.
+    """
+    if isinstance(usage, dict):
+        return usage.get(field)
+    return getattr(usage, field, None)
+
+
+def cached_prompt_tokens(usage) -> int:
+    """Prompt tokens served from the provider's prompt cache, per the response usage."""
+    details = usage_field(usage, "prompt_tokens_details")
+    return usage_field(details, "cached_tokens") or 0
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class _NullTimer:
+    """Context manager used when metrics are disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Thread-safe counters and latency histograms for the pipeline stages.
+
+    Stages are wrapped with the timed decorator or the timer context manager.
+    While disabled, both cost a single attribute check and nothing is recorded,
+    so the instrumentation can stay in place in production code paths.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+
+    def inc(self, name: str, value: float = 1):
+        """Add value to a counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        """Record one latency sample in a histogram."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def _timer(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - started)
+
+    def timer(self, name: str):
+        """Context manager recording the duration of its block as <name>_seconds."""
+        return self._timer(name) if self.enabled else _NULL_TIMER
+
+    def timed(self, name: str):
+        """Decorator recording each call's duration as <name>_seconds."""
+
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    with self._timer(name):
+                        return await func(*args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._timer(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record_usage(self, usage):
+        """Add the token counts of an OpenAI response's usage to the counters."""
+        if not self.enabled or usage is None:
+            return
+        self.inc("llm_requests")
+        for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            self.inc(f"llm_{field}", usage_field(usage, field) or 0)
+        self.inc("llm_cached_prompt_tokens", cached_prompt_tokens(usage))
+
+    def reset(self):
+        """Drop every recorded value."""
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self) -> dict:
+        """Return the counters and histogram summaries as plain data."""
+        with self._lock:
+            return {
+                "counters": dict(sorted(self.counters.items())),
+                "histograms": {
+                    name: histogram.snapshot()
+                    for name, histogram in sorted(self.histograms.items())
+                },
+            }
+
+    def to_json(self) -> str:
+        """Export the metrics as a JSON document."""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Export the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = f"{PROMETHEUS_PREFIX}{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+            for name, histogram in sorted(self.histograms.items()):
+                metric = f"{PROMETHEUS_PREFIX}{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(
+                    [*map(str, histogram.buckets), "+Inf"], histogram.counts
+                ):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f"{metric}_sum {histogram.sum}")
+                lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write the metrics to path: Prometheus text for .prom/.txt, else JSON."""
+        text = (
+            self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        )
+        with open(path, "w") as file:
+            file.write(text)
+
+
+# Process-wide metrics shared by all components
+metrics = Metrics(enabled=METRICS_ENABLED)
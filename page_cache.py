@@ -0,0 +1,107 @@
+import hashlib
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from cache_store import SqliteCache
+
+# Query parameters that only track where a click came from and never change the page
+TRACKING_PARAMS = {"gclid", "fbclid", "mc_cid", "mc_eid"}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a job URL so equivalent links share a cache entry.
+
+    Lowercases the scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class PageCache:
+    """
+    Persistent cache of fetched job pages and their extracted text.
+
+    Entries are keyed by the SHA-256 of the normalized URL and hold the raw HTML,
+    the extracted text, a hash of the HTML and the ETag/Last-Modified validators.
+    Entries younger than ttl are served without touching the network; older ones
+    are revalidated with a conditional request.
+    """
+
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        """
+        Args:
+            path (str): SQLite database file
+            ttl (float): Seconds an entry is served without revalidation
+            max_bytes (int): Size bound for LRU eviction
+        """
+        self.ttl = ttl
+        self.store = SqliteCache(path, max_bytes)
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Return the cache key for a URL."""
+        return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+    def get(self, url: str) -> Optional[dict]:
+        """Return the cached entry for url, or None."""
+        return self.store.get(self.key(url))
+
+    def is_fresh(self, entry: dict) -> bool:
+        """Check whether an entry can be used without revalidation."""
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def conditional_headers(self, entry: dict) -> dict:
+        """Build If-None-Match/If-Modified-Since headers for revalidating an entry."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(
+        self,
+        url: str,
+        html: str,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> dict:
+        """Store a freshly fetched page and return the new entry."""
+        entry = {
+            "url": normalize_url(url),
+            "html": html,
+            "text": text,
+            "content_hash": self.content_hash(html),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        self.store.put(self.key(url), entry)
+        return entry
+
+    def revalidated(self, url: str, entry: dict) -> dict:
+        """Mark an entry as confirmed fresh by the server (HTTP 304)."""
+        entry = dict(entry, fetched_at=time.time())
+        self.store.put(self.key(url), entry)
+        return entry
+
+    @staticmethod
+    def content_hash(html: str) -> str:
+        """Return the SHA-256 of a page body."""
+        return hashlib.sha256(html.encode("utf-8", "replace")).hexdigest()
@@ -0,0 +1,117 @@
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from recipient_loader import recipient_name
+
+# {{field}} or {{field|default}}; anything else in braces is left as text
+SLOT_PATTERN = re.compile(r"\{\{\s*([a-z_][a-z0-9_]*)\s*(?:\|([^{}]*))?\}\}", re.I)
+
+# CSV columns (lowercased) that fill each standard slot, in order of preference
+FIELD_COLUMNS = {
+    "company": ("company", "company_name", "organization", "organisation"),
+    "role": ("role", "title", "job_title", "position"),
+    "last_name": ("last_name", "lastname", "surname"),
+}
+# Used when a slot has no inline default and the recipient has no value for it
+SLOT_DEFAULTS = {"first_name": "there"}
+
+# The greeting line the model writes with "Hello" as the name placeholder. Only a
+# bare greeting matches; "Hi there," or "Dear Hiring Manager," already has an
+# addressee and is left alone.
+GREETING_PATTERN = re.compile(r"^([ \t]*)(Hello|Hi|Dear)[ \t]*(?=[,!]|$)", re.M)
+
+
+class SlotTemplate:
+    """
+    Text with named {{field}} slots, split once into literal and slot segments.
+
+    Rendering joins the literals with the recipient's values, so its cost grows
+    with the number of slots rather than with the size of the text.
+    """
+
+    def __init__(self, text: str):
+        self.literals: List[str] = []
+        self.slots: List[Tuple[str, Optional[str]]] = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(text):
+            self.literals.append(text[position : match.start()])
+            self.slots.append((match.group(1).lower(), match.group(2)))
+            position = match.end()
+        self.literals.append(text[position:])
+
+    @property
+    def fields(self) -> List[str]:
+        """Names of the fields used by the slots, in order of first use."""
+        return list(dict.fromkeys(name for name, _ in self.slots))
+
+    def render(
+        self,
+        values: Optional[Dict[str, str]] = None,
+        escape: Optional[Callable[[str], str]] = None,
+    ) -> str:
+        """
+        Fill the slots for one recipient.
+
+        Args:
+            values (Optional[Dict[str, str]]): Field values; missing or empty fields
+                use the slot's inline default, then SLOT_DEFAULTS, then ""
+            escape (Optional[Callable[[str], str]]): Applied to every value (e.g.
+                html.escape for HTML bodies)
+
+        Returns:
+            str: The personalized text
+        """
+        if not self.slots:
+            return self.literals[0]
+
+        values = values or {}
+        parts = [self.literals[0]]
+        for (name, default), literal in zip(self.slots, self.literals[1:]):
+            value = values.get(name) or default or SLOT_DEFAULTS.get(name, "")
+            parts.append(escape(value) if escape else value)
+            parts.append(literal)
+        return "".join(parts)
+
+
+def compile_email(content: str) -> str:
+    """
+    Turn a generated email into a slot template.
+
+    The first bare greeting ("Hello", "Hi" or "Dear" at the start of a line and
+    followed by a comma, an exclamation mark or the end of the line) gets a
+    {{first_name}} slot. Slots already in the text, e.g. {{company}} written into
+    the email template, are kept as they are.
+    """
+    return GREETING_PATTERN.sub(r"\1\2 {{first_name}}", content, count=1)
+
+
+def single_line(value: str) -> str:
+    """Join a value's lines with spaces, for slots in headers such as the subject."""
+    return " ".join(value.splitlines())
+
+
+def name_from_email(email: str) -> Optional[str]:
+    """Guess a first name from the local part of an address such as jane.doe@x.com."""
+    local = email.split("@")[0].split("+")[0]
+    name = re.split(r"[._\-\d]+", local)[0]
+    return name.title() if len(name) > 1 else None
+
+
+def recipient_fields(email: str, fields: Optional[dict] = None) -> Dict[str, str]:
+    """
+    Build the slot values for one recipient.
+
+    Every CSV column is available under its lowercased name. The standard fields
+    first_name, last_name, company and role are filled from their usual column
+    names, with first_name falling back to a name guessed from the address.
+    """
+    fields = fields or {}
+    values = {key: value for key, value in fields.items() if isinstance(value, str)}
+    values["email"] = email
+    values["first_name"] = recipient_name(fields) or name_from_email(email) or ""
+    for field, columns in FIELD_COLUMNS.items():
+        if not values.get(field):
+            values[field] = next(
+                (fields[column] for column in columns if fields.get(column)), ""
+            )
+    return values
@@ -0,0 +1,191 @@
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from logger import logger
+
+# Marks the end of the stream flowing through the stage queues
+_DONE = object()
+
+
+def load_job_urls(file_path: str) -> List[str]:
+    """Load job URLs from a file, one per line, ignoring blanks and # comments."""
+    try:
+        with open(file_path, "r") as file:
+            return [
+                line.strip()
+                for line in file
+                if line.strip() and not line.strip().startswith("#")
+            ]
+    except Exception as e:
+        logger.error(f"Error loading job URLs: {str(e)}")
+        return []
+
+
+class BatchPipeline:
+    """
+    Non-interactive scrape -> generate -> send pipeline over many job URLs.
+
+    Scraping and generation run in their own threads and hand work to the next
+    stage through a bounded queue, so the next posting is already being scraped
+    while the current one is being generated or sent. Sending runs on the calling
+    thread, so Ctrl-C interrupts the send in progress and its journaling runs
+    before the earlier stages are stopped.
+    """
+
+    def __init__(
+        self,
+        scrape: Callable[[str], Optional[str]],
+        generate: Callable[[str, str], Tuple[Optional[str], Optional[str]]],
+        send: Callable[[str, str], dict],
+        queue_size: int = 2,
+    ):
+        """
+        Args:
+            scrape: Returns the page text for a job URL, or None on failure
+            generate: Takes (job_url, page_text) and returns (content, subject)
+            send: Takes (subject, content) and returns the send statistics dict
+            queue_size (int): Maximum postings waiting between two stages
+        """
+        self.scrape = scrape
+        self.generate = generate
+        self.send = send
+        self.queue_size = queue_size
+
+    def run(self, job_urls: Iterable[str]) -> List[dict]:
+        """
+        Process every job URL through the pipeline.
+
+        Returns:
+            List[dict]: One report entry per URL, in input order
+        """
+        reports = []
+        generate_queue = queue.Queue(maxsize=self.queue_size)
+        send_queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+
+        def put(target: queue.Queue, item) -> bool:
+            """Hand an item to the next stage, giving up once the run stops."""
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def get(source: queue.Queue):
+            """Take the next item from the previous stage, or _DONE once stopped."""
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            return _DONE
+
+        def scrape_stage():
+            for job_url in job_urls:
+                if stop.is_set():
+                    break
+                report = {"url": job_url, "status": "pending", "error": None}
+                reports.append(report)
+                started = time.perf_counter()
+                try:
+                    logger.info(f"Scraping {job_url}")
+                    page_text = self.scrape(job_url)
+                    if not page_text:
+                        raise RuntimeError("failed to scrape job page content")
+                    put(generate_queue, (report, page_text))
+                except Exception as e:
+                    self._fail(report, "scrape", e)
+                report["scrape_seconds"] = round(time.perf_counter() - started, 3)
+            put(generate_queue, _DONE)
+
+        def generate_stage():
+            while (item := get(generate_queue)) is not _DONE:
+                report, page_text = item
+                started = time.perf_counter()
+                try:
+                    logger.info(f"Generating email for {report['url']}")
+                    content, subject = self.generate(report["url"], page_text)
+                    if not content or not subject:
+                        raise RuntimeError(
+                            "failed to generate email content or subject"
+                        )
+                    report["subject"] = subject
+                    put(send_queue, (report, subject, content))
+                except Exception as e:
+                    self._fail(report, "generate", e)
+                report["generate_seconds"] = round(time.perf_counter() - started, 3)
+            put(send_queue, _DONE)
+
+        def send_stage():
+            while (item := get(send_queue)) is not _DONE:
+                report, subject, content = item
+                started = time.perf_counter()
+                try:
+                    logger.info(f"Sending emails for {report['url']}")
+                    stats = self.send(subject, content)
+                    report["stats"] = {
+                        key: stats.get(key, 0)
+                        for key in (
+                            "total",
+                            "successful",
+                            "failed",
+                            "skipped",
+                            "suppressed",
+                        )
+                    }
+                    report["status"] = (
+                        "sent" if stats["successful"] or stats["skipped"] else "failed"
+                    )
+                except Exception as e:
+                    self._fail(report, "send", e)
+                report["send_seconds"] = round(time.perf_counter() - started, 3)
+
+        threads = [
+            threading.Thread(target=stage, name=stage.__name__, daemon=True)
+            for stage in (scrape_stage, generate_stage)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            send_stage()
+        finally:
+            # On Ctrl-C the send stage has already journaled what it sent; stop
+            # the earlier stages before re-raising so no more postings start
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        return reports
+
+    def _fail(self, report: dict, stage: str, error: Exception):
+        """Record a stage failure on a posting's report."""
+        logger.error(f"{stage.title()} failed for {report['url']}: {str(error)}")
+        report["status"] = "failed"
+        report["stage"] = stage
+        report["error"] = str(error)
+
+
+def summarize(reports: List[dict]):
+    """Log a summary report for a batch run."""
+    logger.info("\nBatch run completed!")
+    logger.info("-" * 50)
+    for report in reports:
+        line = f"[{report['status']}] {report['url']}"
+        if report.get("stats"):
+            stats = report["stats"]
+            line += f" - sent {stats['successful']}/{stats['total']}"
+        if report.get("error"):
+            line += f" - {report['stage']}: {report['error']}"
+        logger.info(line)
+    logger.info("-" * 50)
+
+    sent = sum(1 for report in reports if report["status"] == "sent")
+    emails = sum(report.get("stats", {}).get("successful", 0) for report in reports)
+    logger.info(f"Job postings processed: {len(reports)}")
+    logger.info(f"Job postings sent: {sent}")
+    logger.info(f"Job postings failed: {len(reports) - sent}")
+    logger.info(f"Emails sent: {emails}")
@@ -0,0 +1,144 @@
+import asyncio
+import collections
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls to at most `rate` per second."""
+
+    def __init__(self, rate: Optional[float] = None):
+        """
+        Args:
+            rate (Optional[float]): Maximum calls per second. None or 0 disables limiting.
+        """
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        """Block until the caller is allowed to make the next call."""
+        if not self.rate:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_success(self):
+        """Report a successful call (used by adaptive subclasses)."""
+
+    def on_throttle(self):
+        """Report that the server throttled a call (used by adaptive subclasses)."""
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    Rate limiter that adapts to server throttling with AIMD.
+
+    Every success raises the rate so it grows by about `increase` calls/second per
+    second; every throttle (at most once per `cooldown` seconds, so one burst of
+    429s counts once) multiplies it by `decrease`. Starting unlimited, the first
+    throttle sets the rate from the throughput observed over the last few seconds.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        min_rate: float = 0.5,
+        increase: float = 1.0,
+        decrease: float = 0.7,
+        cooldown: float = 1.0,
+    ):
+        """
+        Args:
+            rate (Optional[float]): Starting calls per second, None or 0 for unlimited
+            max_rate (Optional[float]): Never go above this rate
+            min_rate (float): Never go below this rate
+            increase (float): Additive increase in calls/second per second of success
+            decrease (float): Multiplicative decrease factor on throttling
+            cooldown (float): Minimum seconds between two decreases
+        """
+        super().__init__(rate)
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._last_decrease = 0.0
+        self._recent = collections.deque()
+
+    def acquire(self):
+        super().acquire()
+        with self._lock:
+            now = time.monotonic()
+            self._recent.append(now)
+            while self._recent and now - self._recent[0] > 5.0:
+                self._recent.popleft()
+
+    def on_success(self):
+        with self._lock:
+            if self.rate:
+                self.rate += self.increase / self.rate
+                if self.max_rate:
+                    self.rate = min(self.rate, self.max_rate)
+
+    def on_throttle(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+
+            if self.rate:
+                current = self.rate
+            elif len(self._recent) > 1:
+                # Throughput over the recent window of calls
+                current = len(self._recent) / max(now - self._recent[0], 1.0)
+            else:
+                current = self.min_rate * 2
+            self.rate = max(self.min_rate, current * self.decrease)
+            # Push the next slot out so the slowdown applies immediately
+            self._next_slot = max(self._next_slot, now + 1.0 / self.rate)
+
+
+class AsyncTokenBucket:
+    """Asyncio token bucket that refills `per_minute` tokens evenly over each minute."""
+
+    def __init__(self, per_minute: Optional[float] = None):
+        """
+        Args:
+            per_minute (Optional[float]): Bucket capacity and refill per minute.
+                None or 0 disables limiting.
+        """
+        self.per_minute = per_minute
+        self._tokens = per_minute or 0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1):
+        """Wait until `amount` tokens are available and take them."""
+        if not self.per_minute:
+            return
+
+        # A single request larger than the bucket can never fit, so cap it
+        amount = min(amount, self.per_minute)
+        rate = self.per_minute / 60.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.per_minute, self._tokens + (now - self._updated) * rate
+                )
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / rate)
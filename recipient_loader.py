@@ -0,0 +1,159 @@
+import csv
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import tempfile
+from typing import Iterator, Optional
+
+from logger import logger
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, expected_items: int, false_positive_rate: float = 0.01):
+        """
+        Args:
+            expected_items (int): Number of items the filter is sized for
+            false_positive_rate (float): Target false positive rate at that size
+        """
+        bits = -expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)
+        self.size = max(8, int(bits))
+        self.hash_count = max(1, round(self.size / expected_items * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hashing: derive all positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class SeenSet:
+    """
+    Exact set of strings with bounded memory.
+
+    Items live in a temporary on-disk SQLite table; a Bloom filter in front of it
+    answers most "not seen yet" checks without touching the disk.
+    """
+
+    def __init__(self, expected_items: int = 1_000_000):
+        self.bloom = BloomFilter(expected_items)
+        handle, self.path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(handle)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE seen (item TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, item: str) -> bool:
+        """Add item, returning True if it was not seen before."""
+        if item in self.bloom:
+            exists = self._conn.execute(
+                "SELECT 1 FROM seen WHERE item = ?", (item,)
+            ).fetchone()
+            if exists:
+                return False
+        self.bloom.add(item)
+        self._conn.execute("INSERT INTO seen (item) VALUES (?)", (item,))
+        return True
+
+    def close(self):
+        self._conn.close()
+        os.remove(self.path)
+
+
+class RecipientLoader:
+    """
+    Lazily streams recipients from a CSV file.
+
+    Each iteration re-reads the file row by row, yielding one dict per valid,
+    not-yet-seen address with every CSV column (lowercased names) included, so
+    extra columns such as first_name are available without loading the file.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        email_column: str = "email",
+        expected_rows: int = 1_000_000,
+    ):
+        """
+        Args:
+            file_path (str): CSV file with a header row
+            email_column (str): Name of the column holding the email address
+            expected_rows (int): Sizing hint for the deduplication filter
+        """
+        self.file_path = file_path
+        self.email_column = email_column.lower()
+        self.expected_rows = expected_rows
+
+    def validate(self) -> bool:
+        """Check that the file can be read and has the email column."""
+        try:
+            with open(self.file_path, "r", newline="", encoding="utf-8-sig") as file:
+                header = next(csv.reader(file), [])
+        except Exception as e:
+            logger.error(f"Error loading email dataset: {str(e)}")
+            return False
+
+        if self.email_column not in (column.strip().lower() for column in header):
+            logger.error(f"Email dataset has no '{self.email_column}' column")
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[dict]:
+        seen = SeenSet(self.expected_rows)
+        invalid = duplicates = 0
+        try:
+            with open(self.file_path, "r", newline="", encoding="utf-8-sig") as file:
+                reader = csv.reader(file)
+                columns = [column.strip().lower() for column in next(reader, [])]
+                for row in reader:
+                    recipient = dict(zip(columns, (value.strip() for value in row)))
+                    email = recipient.get(self.email_column, "")
+                    if not EMAIL_PATTERN.match(email):
+                        invalid += 1
+                        continue
+                    if not seen.add(email.lower()):
+                        duplicates += 1
+                        continue
+                    recipient["email"] = email
+                    yield recipient
+        finally:
+            seen.close()
+            if invalid or duplicates:
+                logger.info(
+                    f"Skipped {invalid} invalid and {duplicates} duplicate addresses"
+                )
+
+
+def unpack_recipient(recipient) -> tuple:
+    """Split a recipient (address string or loader row dict) into (email, fields)."""
+    if isinstance(recipient, dict):
+        return recipient.get("email"), recipient
+    return recipient, {}
+
+
+def recipient_name(fields: dict) -> Optional[str]:
+    """Return the recipient's first name from CSV columns, if present."""
+    for column in ("first_name", "firstname", "name"):
+        value = fields.get(column)
+        if value:
+            return value.split()[0]
+    return None
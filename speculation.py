@@ -0,0 +1,109 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+from logger import logger
+
+
+class _HeldLogs(logging.Filter):
+    """
+    Logger filter that holds back the records logged by background task threads.
+
+    Each task's records are kept with the task and replayed when its result is
+    collected, so background work doesn't print over the operator's prompt.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.buffers: Dict[int, List[logging.LogRecord]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        buffer = self.buffers.get(threading.get_ident())
+        if buffer is None:
+            return True
+        buffer.append(record)
+        return False
+
+
+_held_logs = _HeldLogs()
+logger.addFilter(_held_logs)
+
+
+class BackgroundTask:
+    """
+    A function started in a daemon thread whose result is collected later.
+
+    Cancelling doesn't interrupt the function (a request already sent to the
+    model or Gmail can't be taken back); its result is just discarded, and since
+    the thread is a daemon it never keeps the program from exiting. What the
+    function logs is held back until its result is collected, and dropped if the
+    task is cancelled.
+    """
+
+    def __init__(self, name: str, func: Callable[..., Any], *args, **kwargs):
+        self.name = name
+        self.cancelled = False
+        self._result = None
+        self._error = None
+        self._logs: List[logging.LogRecord] = []
+        self._thread = threading.Thread(
+            target=self._run, args=(func, args, kwargs), name=name, daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, func, args, kwargs):
+        ident = threading.get_ident()
+        _held_logs.buffers[ident] = self._logs
+        try:
+            self._result = func(*args, **kwargs)
+        except Exception as e:
+            self._error = e
+        finally:
+            del _held_logs.buffers[ident]
+
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def result(self) -> Any:
+        """
+        Wait for the function and return its result, re-raising its exception.
+
+        The records it logged are replayed first, on the calling thread.
+        """
+        if self.cancelled:
+            raise RuntimeError(f"Background task {self.name} was cancelled")
+        self._thread.join()
+        logs, self._logs = self._logs, []
+        for record in logs:
+            logger.handle(record)
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Speculation:
+    """Named background tasks started ahead of the operator's confirmation."""
+
+    def __init__(self):
+        self.tasks: Dict[str, BackgroundTask] = {}
+
+    def start(self, name: str, func: Callable[..., Any], *args, **kwargs):
+        """Start func(*args, **kwargs) in the background under name."""
+        self.tasks[name] = BackgroundTask(name, func, *args, **kwargs)
+
+    def result(self, name: str) -> Any:
+        """Wait for a task's result, saying so if the operator has to wait for it."""
+        task = self.tasks[name]
+        if not task.done():
+            logger.info(f"Waiting for background {name}...")
+        return task.result()
+
+    def cancel(self):
+        """Discard every task that is still running."""
+        for task in self.tasks.values():
+            if not task.done():
+                logger.info(f"Cancelling background {task.name}")
+            task.cancel()
@@ -0,0 +1,196 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from logger import logger
+from recipient_loader import SeenSet
+
+# Providers that ignore dots in the local part of an address
+DOTLESS_DOMAINS = {"gmail.com", "googlemail.com"}
+DOMAIN_ALIASES = {"googlemail.com": "gmail.com"}
+
+# Reasons a recipient is not mailed
+DUPLICATE = "duplicate"
+RECENTLY_CONTACTED = "recently_contacted"
+
+
+def normalize_address(email: str) -> str:
+    """
+    Normalize an address so variants of one mailbox compare equal.
+
+    Lowercases it, drops +tags, and for Gmail also drops dots in the local part
+    (jane.doe+jobs@GoogleMail.com -> janedoe@gmail.com).
+    """
+    local, _, domain = email.strip().lower().rpartition("@")
+    domain = DOMAIN_ALIASES.get(domain, domain)
+    local = local.split("+", 1)[0]
+    if domain in DOTLESS_DOMAINS:
+        local = local.replace(".", "")
+    return f"{local}@{domain}"
+
+
+def address_hash(email: str) -> int:
+    """64-bit hash of the normalized address, stored instead of the address."""
+    digest = hashlib.blake2b(normalize_address(email).encode(), digest_size=8)
+    return int.from_bytes(digest.digest(), "big", signed=True)
+
+
+class SuppressionIndex:
+    """
+    Persistent suppression list and contact history, checked before every send.
+
+    Addresses are stored as 64-bit hashes of their normalized form in SQLite
+    integer primary keys, so each check is an indexed lookup and opening the index
+    doesn't read the stored history. Within a run, normalized addresses are
+    deduplicated with a disk-backed seen set, keeping memory bounded for campaigns
+    with millions of recipients.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        campaign_id: Optional[str] = None,
+        recontact_days: float = 0,
+        expected_items: int = 1_000_000,
+        flush_every: int = 500,
+    ):
+        """
+        Args:
+            path (str): SQLite database file
+            campaign_id (Optional[str]): Campaign being sent; its own earlier sends
+                don't count as recent contacts (the campaign journal handles those)
+            recontact_days (float): Skip addresses contacted by another campaign this
+                many days ago or less; 0 disables the history check
+            expected_items (int): Sizing hint for the seen set
+            flush_every (int): Commit contact history after this many sends
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.campaign_id = campaign_id
+        self.recontact_seconds = recontact_days * 24 * 60 * 60
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._pending = []
+        self._seen = None
+        self._expected_items = expected_items
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS suppressions (
+                address_hash INTEGER PRIMARY KEY,
+                reason TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS contacts (
+                address_hash INTEGER PRIMARY KEY,
+                campaign_id TEXT,
+                sent_at REAL NOT NULL
+            )
+            """)
+        self._conn.commit()
+
+    def check(self, email: str) -> Optional[str]:
+        """
+        Decide whether email may be sent in this run.
+
+        Returns None if it may, otherwise the reason it is skipped: the stored
+        suppression reason (e.g. "unsubscribed", "bounced"), "duplicate" for a
+        repeat of an address already seen in this run, or "recently_contacted".
+        """
+        key = address_hash(email)
+        with self._lock:
+            if self._seen is None:
+                self._seen = SeenSet(self._expected_items)
+            if not self._seen.add(str(key)):
+                return DUPLICATE
+
+            row = self._conn.execute(
+                "SELECT reason FROM suppressions WHERE address_hash = ?", (key,)
+            ).fetchone()
+            if row:
+                return row[0]
+
+            if self.recontact_seconds:
+                row = self._conn.execute(
+                    "SELECT campaign_id, sent_at FROM contacts WHERE address_hash = ?",
+                    (key,),
+                ).fetchone()
+                if (
+                    row
+                    and row[0] != self.campaign_id
+                    and time.time() - row[1] <= self.recontact_seconds
+                ):
+                    return RECENTLY_CONTACTED
+        return None
+
+    def suppress(self, emails: Iterable[str], reason: str = "unsubscribed") -> int:
+        """
+        Add addresses to the suppression list.
+
+        Returns:
+            int: Number of addresses stored
+        """
+        rows = [(address_hash(email), reason, time.time()) for email in emails if email]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO suppressions (address_hash, reason, created_at) "
+                "VALUES (?, ?, ?) ON CONFLICT (address_hash) DO UPDATE SET "
+                "reason = excluded.reason, created_at = excluded.created_at",
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def record_sent(self, email: str):
+        """Add a successful send to the contact history (committed in batches)."""
+        key = address_hash(email)
+        with self._lock:
+            self._pending.append((key, self.campaign_id, time.time()))
+            if len(self._pending) >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._conn.executemany(
+                "INSERT INTO contacts (address_hash, campaign_id, sent_at) "
+                "VALUES (?, ?, ?) ON CONFLICT (address_hash) DO UPDATE SET "
+                "campaign_id = excluded.campaign_id, sent_at = excluded.sent_at",
+                self._pending,
+            )
+            self._conn.commit()
+            self._pending = []
+
+    def close(self):
+        """Commit pending history and close the database."""
+        with self._lock:
+            self._flush()
+            self._conn.close()
+            if self._seen is not None:
+                self._seen.close()
+                self._seen = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def load_addresses(file_path: str) -> Iterable[str]:
+    """Read addresses to suppress, one per line (a CSV's first column is used)."""
+    try:
+        with open(file_path, "r") as file:
+            for line in file:
+                address = line.split(",")[0].strip().strip('"')
+                if "@" in address:
+                    yield address
+    except Exception as e:
+        logger.error(f"Error loading addresses: {str(e)}")
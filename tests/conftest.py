@@ -0,0 +1,99 @@
+"""Shared fakes for the send path, used by the tests and the pipeline benchmark."""
+
+import json
+import threading
+import time
+
+from email_sender import EmailSender
+
+
+class FakeResponse(dict):
+    """httplib2-style response: a header dict with a status attribute."""
+
+    def __init__(self, status, headers=None):
+        super().__init__(headers or {})
+        self.status = status
+
+
+class FakeHttpError(Exception):
+    """Shaped like googleapiclient's HttpError for gmail_errors.classify_error."""
+
+    def __init__(self, status, reason, headers=None):
+        super().__init__(f"{status} {reason}")
+        self.resp = FakeResponse(status, headers)
+        self.content = json.dumps({"error": {"errors": [{"reason": reason}]}}).encode()
+
+
+class FakeGmail:
+    """
+    Stand-in for the Gmail API service: users().messages().send() and batches.
+
+    errors[n] is raised by the n-th single send and batch_errors[n] is reported
+    for every request of the n-th batch (both 1-based). Each send or batch takes
+    latency seconds, and sent counts the messages delivered.
+    """
+
+    def __init__(self, latency=0.0, errors=None, batch_errors=None):
+        self.latency = latency
+        self.errors = errors or {}
+        self.batch_errors = batch_errors or {}
+        self.calls = 0
+        self.batches = 0
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def send(self, userId, body):
+        return self
+
+    def execute(self):
+        with self._lock:
+            self.calls += 1
+            error = self.errors.get(self.calls)
+        if error:
+            raise error
+        time.sleep(self.latency)
+        self._deliver(1)
+        return {"id": "sent"}
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def _deliver(self, count):
+        with self._lock:
+            self.sent += count
+
+
+class FakeBatch:
+    """One round trip for all added requests, like a Gmail batch HTTP request."""
+
+    def __init__(self, gmail, callback):
+        self.gmail = gmail
+        self.callback = callback
+        self.request_ids = []
+
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+
+    def execute(self):
+        time.sleep(self.gmail.latency)
+        with self.gmail._lock:
+            self.gmail.batches += 1
+            error = self.gmail.batch_errors.get(self.gmail.batches)
+        if not error:
+            self.gmail._deliver(len(self.request_ids))
+        for request_id in self.request_ids:
+            self.callback(request_id, None if error else {"id": "sent"}, error)
+
+
+def make_sender(service) -> EmailSender:
+    """An EmailSender that sends through service without attaching a resume."""
+    sender = EmailSender()
+    sender.service = service
+    sender.pdf_path = None
+    return sender
@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+import main
+from conftest import FakeGmail, make_sender
+from pipeline import BatchPipeline
+
+RECIPIENTS = [f"person{i}@example.com" for i in range(6)]
+JOB_URLS = [f"https://example.com/jobs/{i}" for i in range(3)]
+
+
+@pytest.fixture(autouse=True)
+def journal_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "CAMPAIGN_JOURNAL_PATH", str(tmp_path / "c.sqlite3"))
+    monkeypatch.setattr(main, "SUPPRESSION_ENABLED", False)
+    monkeypatch.setattr(main, "SEND_USE_BATCH", False)
+
+
+def run(gmail) -> list:
+    pipeline = BatchPipeline(
+        scrape=lambda job_url: f"Posting {job_url}",
+        generate=lambda job_url, page_text: (f"Hello,\n\n{page_text}", page_text),
+        send=lambda subject, content: main.send_campaign(
+            make_sender(gmail), RECIPIENTS, subject, content
+        ),
+    )
+    return pipeline.run(JOB_URLS)
+
+
+def test_interrupted_batch_journals_sends_and_resumes():
+    # Ctrl-C while the second posting's campaign is being sent
+    first = FakeGmail(latency=0.01, errors={len(RECIPIENTS) + 2: KeyboardInterrupt()})
+    with pytest.raises(KeyboardInterrupt):
+        run(first)
+
+    # The earlier stages were stopped and joined before the interrupt propagated
+    stages = {thread.name for thread in threading.enumerate()}
+    assert not stages & {"scrape_stage", "generate_stage"}
+    assert len(RECIPIENTS) < first.sent < 2 * len(RECIPIENTS)
+
+    second = FakeGmail(latency=0.01)
+    reports = run(second)
+
+    # Every send of the interrupted run was journaled, so nobody is emailed twice
+    assert [report["status"] for report in reports] == ["sent"] * len(JOB_URLS)
+    assert sum(report["stats"]["skipped"] for report in reports) == first.sent
+    assert first.sent + second.sent == len(JOB_URLS) * len(RECIPIENTS)
@@ -0,0 +1,57 @@
+import pytest
+
+from campaign_journal import CampaignJournal
+from conftest import FakeGmail, make_sender
+
+RECIPIENTS = [f"person{i}@example.com" for i in range(12)]
+
+
+def send(sender, journal):
+    return sender.send_bulk_emails(
+        RECIPIENTS,
+        "Application",
+        "Hello,\n\nI'm interested in the role.",
+        max_workers=4,
+        rate_limit=0,
+        journal=journal,
+    )
+
+
+def test_interrupted_run_journals_running_sends_and_resumes(tmp_path):
+    path = str(tmp_path / "campaigns.sqlite3")
+
+    first = FakeGmail(latency=0.05, errors={2: KeyboardInterrupt()})
+    with CampaignJournal(path, "campaign") as journal:
+        with pytest.raises(KeyboardInterrupt):
+            send(make_sender(first), journal)
+    # Sends that were already running finished, queued ones were dropped
+    assert 0 < first.sent < len(RECIPIENTS)
+
+    second = FakeGmail(latency=0.05)
+    with CampaignJournal(path, "campaign") as journal:
+        stats = send(make_sender(second), journal)
+
+    # Every send of the first run was journaled, so nobody gets the email twice
+    assert stats["skipped"] == first.sent
+    assert first.sent + second.sent == len(RECIPIENTS)
+    assert stats["successful"] == second.sent
+    assert "results" not in stats
+
+
+def test_is_sent_covers_buffered_and_stored_sends(tmp_path):
+    path = str(tmp_path / "campaigns.sqlite3")
+
+    with CampaignJournal(path, "campaign", flush_every=2) as journal:
+        journal.record("a@example.com", "sent")
+        assert journal.is_sent("a@example.com")  # still buffered
+        journal.record("b@example.com", "failed", "bounced")
+        journal.record("c@example.com", "sent")
+        journal.record("c@example.com", "failed", "retry after resend")
+
+    with CampaignJournal(path, "campaign") as journal:
+        assert journal.is_sent("a@example.com")
+        assert not journal.is_sent("b@example.com")
+        # A sent recipient is never downgraded by a later record
+        assert journal.is_sent("c@example.com")
+    with CampaignJournal(path, "other") as journal:
+        assert not journal.is_sent("a@example.com")
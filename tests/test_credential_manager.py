@@ -0,0 +1,57 @@
+import datetime
+import json
+
+import pytest
+
+from credential_manager import CredentialManager
+
+credentials = pytest.importorskip("google.oauth2.credentials")
+
+SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
+
+
+def write_token(path, expires_in: float):
+    expiry = datetime.datetime.utcnow() + datetime.timedelta(seconds=expires_in)
+    path.write_text(
+        json.dumps(
+            {
+                "token": "access",
+                "refresh_token": "refresh",
+                "client_id": "client",
+                "client_secret": "secret",
+                "scopes": SCOPES,
+                "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            }
+        )
+    )
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    def failing_refresh(self, request):
+        raise OSError("network is unreachable")
+
+    def login(self):
+        pytest.fail("the browser login must not run")
+
+    monkeypatch.setattr(credentials.Credentials, "refresh", failing_refresh)
+    monkeypatch.setattr(CredentialManager, "_login", login)
+    return CredentialManager(str(tmp_path / "token.json"), SCOPES, refresh_margin=300)
+
+
+def test_failed_refresh_keeps_the_loaded_token(manager, tmp_path):
+    write_token(tmp_path / "token.json", expires_in=3600)
+    creds = manager.get()
+
+    manager.refresh_margin = 7200  # the loaded token is now due for a refresh
+    assert manager.get() is creds
+    assert creds.token == "access"
+
+
+def test_non_interactive_first_load_raises_instead_of_logging_in(manager, tmp_path):
+    write_token(tmp_path / "token.json", expires_in=-60)
+
+    with pytest.raises(RuntimeError):
+        manager.get(interactive=False)
+    # A network error must not throw away the saved token
+    assert (tmp_path / "token.json").exists()
@@ -0,0 +1,96 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import email_generator
+from email_generator import EmailGenerator
+
+pytest.importorskip("openai")
+
+
+class MockOpenAI:
+    """Local OpenAI-compatible chat completions server that tracks concurrency."""
+
+    def __init__(self, latency: float):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(
+                    self.rfile.read(int(self.headers["Content-Length"]))
+                )
+                with mock._lock:
+                    mock.in_flight += 1
+                    mock.max_in_flight = max(mock.max_in_flight, mock.in_flight)
+                time.sleep(latency)
+                with mock._lock:
+                    mock.in_flight -= 1
+
+                prompt = " ".join(message["content"] for message in request["messages"])
+                job = re.search(r"example\.com/jobs/(\d+)", prompt).group(1)
+                content = f"SUBJECT: Application {job}\nCONTENT: Hello,\n\nJob {job}"
+                body = json.dumps(
+                    {
+                        "id": "chatcmpl-test",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": request["model"],
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": content},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {
+                            "prompt_tokens": 10,
+                            "completion_tokens": 10,
+                            "total_tokens": 20,
+                        },
+                    }
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_generate_many_caps_concurrency_and_keeps_order(monkeypatch):
+    mock = MockOpenAI(latency=0.2)
+    monkeypatch.setattr(email_generator, "OPENAI_BASE_URL", mock.base_url)
+    monkeypatch.setattr(email_generator, "OPENAI_API_KEY", "test")
+    postings = [(f"https://example.com/jobs/{i}", f"Posting {i}") for i in range(6)]
+
+    try:
+        results = EmailGenerator(cache=False).generate_many(
+            "Hello,\n\n[body]",
+            "Resume",
+            postings,
+            max_concurrency=2,
+            requests_per_minute=0,
+            tokens_per_minute=0,
+        )
+    finally:
+        mock.close()
+
+    assert results == [(f"Hello,\n\nJob {i}", f"Application {i}") for i in range(6)]
+    assert mock.max_in_flight == 2
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from email_generator import EmailGenerator
+from generation_cache import GenerationCache
+
+
+class FakeCompletions:
+    """Chat completions stub that writes a different email on every call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        text = f"SUBJECT: Application {self.calls}\nCONTENT: Draft {self.calls}"
+        message = SimpleNamespace(content=text)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_generator(cache, completions, regenerate=False):
+    generator = EmailGenerator(cache=cache, regenerate=regenerate)
+    generator._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return generator
+
+
+def generate(generator):
+    return generator.generate_email(
+        "Hello,\n\n[body]", "Backend Engineer", "Resume", "https://example.com/1"
+    )
+
+
+def test_regenerate_skips_the_lookup_and_replaces_the_cached_email(tmp_path):
+    cache = GenerationCache(str(tmp_path / "generations.sqlite3"), 1 << 20)
+    completions = FakeCompletions()
+
+    generator = make_generator(cache, completions)
+    first = generate(generator)
+    assert generate(generator) == first
+    assert completions.calls == 1
+
+    fresh = generate(make_generator(cache, completions, regenerate=True))
+    assert fresh != first
+    assert completions.calls == 2
+
+    # Later runs reuse the regenerated email
+    assert generate(make_generator(cache, completions)) == fresh
+    assert completions.calls == 2
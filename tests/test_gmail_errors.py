@@ -0,0 +1,48 @@
+import socket
+import ssl
+
+import pytest
+
+from conftest import FakeHttpError
+from gmail_errors import (
+    PERMANENT,
+    QUOTA_EXHAUSTED,
+    RATE_LIMITED,
+    TRANSIENT,
+    classify_error,
+)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ConnectionResetError(),
+        TimeoutError(),
+        socket.timeout(),
+        socket.gaierror(),
+        ssl.SSLError(),
+        FakeHttpError(503, "backendError"),
+    ],
+)
+def test_network_errors_are_transient(error):
+    assert classify_error(error) == TRANSIENT
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        FileNotFoundError(2, "No such file", "resume.pdf"),
+        PermissionError(13, "Permission denied", "resume.pdf"),
+        IsADirectoryError(21, "Is a directory", "resume.pdf"),
+        ValueError("bad address"),
+        FakeHttpError(400, "invalidArgument"),
+    ],
+)
+def test_local_and_request_errors_are_permanent(error):
+    assert classify_error(error) == PERMANENT
+
+
+def test_quota_and_rate_limit_reasons():
+    assert classify_error(FakeHttpError(403, "dailyLimitExceeded")) == QUOTA_EXHAUSTED
+    assert classify_error(FakeHttpError(403, "userRateLimitExceeded")) == RATE_LIMITED
+    assert classify_error(FakeHttpError(429, "tooManyRequests")) == RATE_LIMITED
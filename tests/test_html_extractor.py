@@ -0,0 +1,66 @@
+import pytest
+
+import html_extractor
+from html_extractor import available_backends, extract_text
+
+DOCUMENTS = {
+    "main preferred": (
+        "<html><head><title>Jobs</title><style>p {}</style></head><body>"
+        "<header>Site</header><nav><a>Home</a></nav>"
+        "<main><h1>Backend Engineer</h1><p>Python and <b>Postgres</b>.</p></main>"
+        "<footer>Legal</footer></body></html>"
+    ),
+    "article": (
+        "<body><p>Intro</p><article><h2>Role</h2><p>Build APIs</p></article></body>"
+    ),
+    "no body": "<div><h1>Backend Engineer</h1><p>Remote</p></div><p>Apply now</p>",
+    "fragment text": "Just some text",
+    "dropped tags": (
+        "<body><p>Keep</p><script>var a = '<p>no</p>';</script>"
+        "<nav><ul><li>Menu</li><li><nav>Inner</nav></li></ul></nav>"
+        "<iframe>Frame</iframe><meta name='x' content='y'><p>Also keep</p></body>"
+    ),
+    "entities": (
+        "<body><p>R&amp;D &lt;team&gt; &eacute;quipe &#8212; &#x2713; caf&#233;</p>"
+        "<p>&nbsp;</p><p>Salary&nbsp;&euro;90k</p></body>"
+    ),
+    "br": "<body><p>Line one<br>Line two<br/>Line three</p><p>a<br><br>b</p></body>",
+    "nested main": (
+        "<body><main><div><main><p>Inner</p></main></div><p>Outer</p></main>"
+        "<p>After</p></body>"
+    ),
+}
+
+
+def backends():
+    found = available_backends()
+    return [
+        pytest.param(
+            backend,
+            marks=pytest.mark.skipif(
+                backend not in found, reason=f"{backend} is not installed"
+            ),
+        )
+        for backend in html_extractor.BACKENDS
+    ]
+
+
+@pytest.mark.parametrize("backend", backends())
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_backends_extract_the_same_text(name, backend):
+    pytest.importorskip("bs4")
+    html = DOCUMENTS[name]
+
+    assert extract_text(html, backend) == extract_text(html, "bs4")
+
+
+def test_extracted_text():
+    assert extract_text(DOCUMENTS["main preferred"], "stream") == (
+        "Backend Engineer\nPython and\nPostgres\n."
+    )
+    assert extract_text(DOCUMENTS["entities"], "stream") == (
+        "R&D <team> équipe — ✓ café\nSalary\xa0€90k"
+    )
+    assert extract_text(DOCUMENTS["br"], "stream") == (
+        "Line one\nLine two\nLine three\na\nb"
+    )
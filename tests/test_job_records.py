@@ -0,0 +1,50 @@
+import os
+from types import SimpleNamespace
+
+import email_generator
+from email_generator import EmailGenerator
+from job_records import JobRecordStore
+
+RECORD = {"title": "Backend Engineer", "company": "Acme"}
+
+
+def test_records_are_only_reused_for_the_same_page_text(tmp_path):
+    directory = str(tmp_path / "jobs")
+    store = JobRecordStore(directory)
+    assert store.get("https://example.com/jobs/1", "Posting") is None
+    # Nothing is created until a record is stored
+    assert not os.path.exists(directory)
+
+    store.put("https://example.com/jobs/1", RECORD, "Posting")
+
+    assert store.get("https://Example.com/jobs/1?utm_source=x", "Posting") == RECORD
+    assert store.get("https://example.com/jobs/1", "Posting, updated") is None
+
+
+class FakeCompletions:
+    """Chat completions stub returning a job record named after the call count."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        content = f'{{"title": "Engineer {self.calls}"}}'
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_changed_posting_is_extracted_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(email_generator, "JOB_RECORDS_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setattr(email_generator, "JOB_EXTRACTION_ENABLED", True)
+    monkeypatch.chdir(tmp_path)
+    generator = EmailGenerator(cache=False)
+    completions = FakeCompletions()
+    generator._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    url = "https://example.com/jobs/1"
+
+    assert generator.extract_job("Posting", url)["title"] == "Engineer 1"
+    assert generator.extract_job("Posting", url)["title"] == "Engineer 1"
+    assert generator.extract_job("Posting, updated", url)["title"] == "Engineer 2"
+    assert completions.calls == 2
+    assert os.listdir(tmp_path) == ["jobs"]
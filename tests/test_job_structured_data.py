@@ -0,0 +1,160 @@
+import json
+
+import pytest
+
+import job_scraper
+from job_scraper import JobScraper
+from job_structured_data import extract_job_record, split_sections
+
+DESCRIPTION = (
+    "<p>We build payments infrastructure.</p>"
+    "<h3>What you'll do</h3><ul><li>Build APIs</li><li>Run services</li></ul>"
+    "<h3>Requirements</h3><ul><li>5 years of Python</li></ul>"
+    "<h3>Nice to have</h3><ul><li>Go</li></ul>"
+)
+POSTING = {
+    "@type": "JobPosting",
+    "title": "Backend Engineer",
+    "hiringOrganization": {"@type": "Organization", "name": "Acme &amp; Co"},
+    "jobLocation": [
+        {"address": {"addressLocality": "Berlin", "addressCountry": "DE"}},
+        {"address": {"addressLocality": "Berlin", "addressCountry": "DE"}},
+    ],
+    "description": DESCRIPTION,
+    "skills": ["Postgres", "Kubernetes"],
+}
+EXPECTED = {
+    "title": "Backend Engineer",
+    "company": "Acme & Co",
+    "location": "Berlin, DE",
+    "responsibilities": ["Build APIs", "Run services"],
+    "required_qualifications": ["5 years of Python", "Postgres", "Kubernetes"],
+    "preferred_qualifications": ["Go"],
+    "other_details": ["We build payments infrastructure."],
+}
+
+
+def page(*scripts, body="<main><h1>Careers</h1><p>Plain page text.</p></main>"):
+    ld = "".join(
+        f'<script type="application/ld+json">{script}</script>' for script in scripts
+    )
+    return f"<html><head>{ld}</head><body>{body}</body></html>"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        POSTING,
+        # Nested in a @graph next to other entities
+        {
+            "@context": "https://schema.org",
+            "@graph": [
+                {"@type": "WebPage", "name": "Careers"},
+                {"@graph": [dict(POSTING, **{"@type": ["JobPosting"]})]},
+            ],
+        },
+        # Inside a top-level list
+        [{"@type": "BreadcrumbList"}, [POSTING]],
+    ],
+)
+def test_json_ld_job_posting(data):
+    assert extract_job_record(page(json.dumps(data))) == EXPECTED
+
+
+def test_malformed_json_ld_is_skipped():
+    html = page("{not json", "", json.dumps(POSTING))
+    assert extract_job_record(html) == EXPECTED
+    assert extract_job_record(page("{not json")) is None
+
+
+def test_json_ld_without_a_job_posting_title_is_ignored():
+    html = page(json.dumps({"@type": "JobPosting", "description": DESCRIPTION}))
+    assert extract_job_record(html) is None
+
+
+def test_greenhouse_markup():
+    body = (
+        '<div id="header"><h1 class="app-title">Backend Engineer</h1>'
+        '<span class="company-name">at Acme</span>'
+        '<div class="location">Berlin<br>Remote</div></div>'
+        f'<div id="content">{DESCRIPTION}<img src="x.png"><script>x = 1</script>'
+        "</div><div>Apply now</div>"
+    )
+    record = extract_job_record(page(body=body), "https://boards.greenhouse.io/a/1")
+
+    assert record == dict(
+        EXPECTED,
+        company="Acme",
+        location="Berlin",
+        required_qualifications=["5 years of Python"],
+    )
+
+
+def test_lever_markup():
+    body = (
+        '<div class="posting-headline"><h2>Backend Engineer</h2>'
+        '<div class="posting-categories">'
+        '<div class="sort-by-location posting-category location">Berlin</div>'
+        "</div></div>"
+        '<div class="section"><h3>What you\'ll do</h3><ul><li>Build APIs</li></ul>'
+        "</div>"
+        '<div class="section"><h3>Requirements</h3><ul><li>Python</li></ul></div>'
+    )
+    record = extract_job_record(page(body=body), "https://jobs.lever.co/acme/1")
+
+    assert record["title"] == "Backend Engineer"
+    assert record["location"] == "Berlin"
+    assert record["responsibilities"] == ["Build APIs"]
+    assert record["required_qualifications"] == ["Python"]
+
+
+def test_workday_meta_tags():
+    head = (
+        '<meta property="og:title" content="Backend Engineer">'
+        '<meta property="og:site_name" content="Acme">'
+        '<meta name="description" content="Requirements&#10;Python&#10;Postgres">'
+    )
+    html = f"<html><head>{head}</head><body></body></html>"
+    record = extract_job_record(html, "https://acme.wd5.myworkdayjobs.com/job/1")
+
+    assert record["title"] == "Backend Engineer"
+    assert record["company"] == "Acme"
+    assert record["required_qualifications"] == ["Python", "Postgres"]
+
+
+def test_pages_without_structured_data_fall_back_to_text(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_scraper, "JOB_RECORDS_DIR", str(tmp_path / "jobs"))
+    scraper = JobScraper(cache=False, extractor="stream", structured=True)
+    html = page(body="<main><h1>Backend Engineer</h1><p>Python.</p></main>")
+
+    assert extract_job_record(html, "https://example.com/jobs/1") is None
+    # Known ATS host, but the markup has no title to build a record from
+    assert extract_job_record(html, "https://boards.greenhouse.io/a/1") is None
+    text = scraper.extract_page("https://example.com/jobs/1", html)
+    assert text == scraper.extract_text(html)
+    assert "Backend Engineer" in text
+
+
+def test_split_sections():
+    lines = [
+        "About Acme",
+        "We build payments.",
+        "Your role:",
+        "• Build APIs",
+        "- Run services",
+        "Must have",
+        "* Python",
+        "Requirements are listed in the next section.",
+        "Bonus points",
+        "Go",
+    ]
+
+    assert split_sections(lines) == {
+        "responsibilities": ["Build APIs", "Run services"],
+        "required_qualifications": [
+            "Python",
+            "Requirements are listed in the next section.",
+        ],
+        "preferred_qualifications": ["Go"],
+        "other_details": ["About Acme", "We build payments."],
+    }
@@ -0,0 +1,61 @@
+import base64
+import email
+import os
+from email import policy
+
+import pytest
+
+from message_template import MessageTemplate
+
+BODIES = {
+    "ascii": "Hello {{first_name}},\n\nI'd like to apply for the role.\n\nBest,\nJane",
+    "non-ascii": (
+        "Hallo {{first_name}},\n\nJ'aimerais postuler — merci ! 日本語もOK.\n\nJané"
+    ),
+}
+# Names of different lengths shift the HTML part's size through every residue mod 3
+NAMES = ["Al", "Bob", "Cara", "Dmitri", "Eve-Lyn", "Zoë", "José María"]
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(b"%PDF-1.4\n" + bytes(range(256)) * 40 + b"\n%%EOF\n")
+    return str(path)
+
+
+def parse(body: dict) -> email.message.EmailMessage:
+    raw = base64.urlsafe_b64decode(body["raw"])
+    return email.message_from_bytes(raw, policy=policy.default)
+
+
+@pytest.mark.parametrize("body", BODIES.values(), ids=BODIES.keys())
+def test_render_round_trips_with_attachment(body, pdf_path):
+    template = MessageTemplate("Application – {{first_name}}", body, pdf_path)
+    with open(pdf_path, "rb") as file:
+        pdf = file.read()
+
+    for name in NAMES:
+        message = parse(template.render("to@example.com", {"first_name": name}))
+
+        assert message["to"] == "to@example.com"
+        assert message["subject"] == f"Application – {name}"
+        html_part, attachment = message.iter_parts()
+        assert html_part.get_content_type() == "text/html"
+        html = html_part.get_content()
+        assert f"{name}," in html
+        assert body.splitlines()[2] in html
+        assert attachment.get_filename() == "resume.pdf"
+        assert attachment.get_content() == pdf
+        assert not message.defects
+
+
+@pytest.mark.parametrize("body", BODIES.values(), ids=BODIES.keys())
+def test_render_without_attachment(body, tmp_path):
+    missing = os.path.join(str(tmp_path), "missing.pdf")
+    template = MessageTemplate("Application", body, missing)
+
+    message = parse(template.render("to@example.com", {"first_name": "Zoë"}))
+
+    (html_part,) = message.iter_parts()
+    assert "Zoë," in html_part.get_content()
@@ -0,0 +1,64 @@
+import types
+
+import pytest
+
+from metrics import Metrics
+
+COUNTS = {
+    "llm_requests": 1,
+    "llm_prompt_tokens": 120,
+    "llm_completion_tokens": 30,
+    "llm_total_tokens": 150,
+    "llm_cached_prompt_tokens": 64,
+}
+
+
+def test_record_usage_reads_dict_shaped_usage():
+    # What the pinned SDK leaves on the final chunk of a stream
+    usage = {
+        "prompt_tokens": 120,
+        "completion_tokens": 30,
+        "total_tokens": 150,
+        "prompt_tokens_details": {"cached_tokens": 64},
+    }
+    metrics = Metrics(enabled=True)
+
+    metrics.record_usage(usage)
+
+    assert metrics.counters == COUNTS
+
+
+def test_record_usage_reads_usage_objects():
+    usage = types.SimpleNamespace(
+        prompt_tokens=120,
+        completion_tokens=30,
+        total_tokens=150,
+        prompt_tokens_details={"cached_tokens": 64},
+    )
+    metrics = Metrics(enabled=True)
+
+    metrics.record_usage(usage)
+
+    assert metrics.counters == COUNTS
+
+
+def test_streamed_chunk_usage_is_counted():
+    openai_types = pytest.importorskip("openai.types.chat")
+    chunk = openai_types.ChatCompletionChunk(
+        id="chatcmpl-test",
+        object="chat.completion.chunk",
+        created=0,
+        model="gpt-4o-mini",
+        choices=[],
+        usage={
+            "prompt_tokens": 120,
+            "completion_tokens": 30,
+            "total_tokens": 150,
+            "prompt_tokens_details": {"cached_tokens": 64},
+        },
+    )
+    metrics = Metrics(enabled=True)
+
+    metrics.record_usage(getattr(chunk, "usage", None))
+
+    assert metrics.counters == COUNTS
@@ -0,0 +1,120 @@
+import threading
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import cache_store
+from cache_store import SqliteCache
+from job_scraper import JobScraper
+from page_cache import PageCache, normalize_url
+
+PAGE = (
+    "<html><body><main><h1>Backend Engineer</h1>"
+    "<p>Python and Postgres.</p></main></body></html>"
+)
+ETAG = '"v1"'
+LAST_MODIFIED = "Sat, 17 Oct 2026 12:00:00 GMT"
+
+
+class StubServer:
+    """Local job page server that honors If-None-Match and records each request."""
+
+    def __init__(self):
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(dict(self.headers))
+                if self.headers.get("If-None-Match") == ETAG:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = PAGE.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", ETAG)
+                self.send_header("Last-Modified", LAST_MODIFIED)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/jobs/1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+def make_scraper(tmp_path, ttl: float) -> JobScraper:
+    pytest.importorskip("httpx")
+    cache = PageCache(str(tmp_path / "pages.sqlite3"), ttl=ttl, max_bytes=1 << 20)
+    return JobScraper(cache=cache, extractor="stream", structured=False)
+
+
+def test_fresh_entry_skips_the_network(stub, tmp_path):
+    scraper = make_scraper(tmp_path, ttl=3600)
+
+    first = scraper.scrape_job_description(stub.url)
+    second = scraper.scrape_job_description(f"{stub.url}?utm_source=mail#apply")
+    scraper.close()
+
+    assert "Backend Engineer" in first
+    assert second == first
+    assert len(stub.requests) == 1
+
+
+def test_stale_entry_is_revalidated_with_304(stub, tmp_path):
+    scraper = make_scraper(tmp_path, ttl=0)
+
+    first = scraper.scrape_job_description(stub.url)
+    entry = scraper.cache.get(stub.url)
+    second = scraper.scrape_job_description(stub.url)
+    scraper.close()
+
+    assert second == first
+    assert len(stub.requests) == 2
+    assert "If-None-Match" not in stub.requests[0]
+    assert stub.requests[1]["If-None-Match"] == ETAG
+    assert stub.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+    # The 304 renews the entry instead of storing a new body
+    assert scraper.cache.get(stub.url)["fetched_at"] > entry["fetched_at"]
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path, monkeypatch):
+    clock = iter(range(1, 100))
+    monkeypatch.setattr(
+        cache_store, "time", types.SimpleNamespace(time=lambda: next(clock))
+    )
+    value = {"text": "x" * 100}
+    cache = SqliteCache(str(tmp_path / "cache.sqlite3"), max_bytes=250)
+
+    cache.put("a", value)
+    cache.put("b", value)
+    assert cache.get("a") == value  # a is now more recently used than b
+    cache.put("c", value)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == value
+    assert cache.get("c") == value
+    assert cache.stats()["entries"] == 2
+    cache.close()
+
+
+def test_normalize_url_shares_entries_between_equivalent_links():
+    assert normalize_url("HTTPS://Jobs.Example.com:443/a?b=2&utm_medium=x&a=1#top") == (
+        "https://jobs.example.com/a?a=1&b=2"
+    )
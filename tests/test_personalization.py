@@ -0,0 +1,76 @@
+import base64
+import email
+import html
+from email import policy
+
+import pytest
+
+from message_template import MessageTemplate
+from personalization import SlotTemplate, compile_email, recipient_fields
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("Hello,\n\nBody", "Hello {{first_name}},\n\nBody"),
+        ("Hi!\nBody", "Hi {{first_name}}!\nBody"),
+        ("  Dear ,\nBody", "  Dear {{first_name}},\nBody"),
+        ("Hello\n\nBody", "Hello {{first_name}}\n\nBody"),
+        # Greetings that already name someone keep their addressee
+        ("Hi there,\n\nBody", "Hi there,\n\nBody"),
+        ("Dear Hiring Manager,\n\nBody", "Dear Hiring Manager,\n\nBody"),
+        ("Hello {{first_name}},\n\nBody", "Hello {{first_name}},\n\nBody"),
+        ("Helloworld,\n\nBody", "Helloworld,\n\nBody"),
+    ],
+)
+def test_compile_email_only_fills_bare_greetings(content, expected):
+    assert compile_email(content) == expected
+
+
+def test_compile_email_fills_only_the_first_greeting():
+    content = "Hello,\n\nBody\n\nHi,\nagain"
+    assert compile_email(content) == "Hello {{first_name}},\n\nBody\n\nHi,\nagain"
+
+
+def test_slot_template_defaults_and_escaping():
+    template = SlotTemplate("Hi {{ First_Name }}, {{company|your team}} {{x}}!")
+
+    assert template.fields == ["first_name", "company", "x"]
+    assert template.render() == "Hi there, your team !"
+    assert template.render({"first_name": "Jane", "company": "A&B"}) == (
+        "Hi Jane, A&B !"
+    )
+    assert template.render({"company": "A&B"}, escape=html.escape) == (
+        "Hi there, A&amp;B !"
+    )
+    assert SlotTemplate("{not a slot} {{}}").render() == "{not a slot} {{}}"
+
+
+def test_recipient_fields_maps_columns_and_guesses_names():
+    values = recipient_fields(
+        "jane.doe+jobs@example.com",
+        {"name": "Jane Doe", "organization": "Acme", "job_title": "CTO", "n": 3},
+    )
+
+    assert values["first_name"] == "Jane"
+    assert values["company"] == "Acme"
+    assert values["role"] == "CTO"
+    assert values["last_name"] == ""
+    assert values["email"] == "jane.doe+jobs@example.com"
+    assert values["organization"] == "Acme"
+    assert "n" not in values
+    assert recipient_fields("jane.doe@example.com")["first_name"] == "Jane"
+    assert recipient_fields("j@example.com")["first_name"] == ""
+
+
+def test_subject_slot_values_cannot_inject_headers():
+    template = MessageTemplate("Role at {{company}}", "Hello {{first_name}},")
+    values = recipient_fields(
+        "jane@example.com", {"company": "Acme\r\nBcc: victim@example.com"}
+    )
+
+    raw = base64.urlsafe_b64decode(template.render("jane@example.com", values)["raw"])
+    message = email.message_from_bytes(raw, policy=policy.default)
+
+    assert message["subject"] == "Role at Acme Bcc: victim@example.com"
+    assert message["bcc"] is None
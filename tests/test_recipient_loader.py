@@ -0,0 +1,17 @@
+from recipient_loader import RecipientLoader
+
+
+def test_reads_excel_utf8_csv_with_bom(tmp_path):
+    path = tmp_path / "email_dataset.csv"
+    path.write_bytes(
+        "\ufeffEmail,First_Name,Company\n"
+        "zoe@example.com,Zoë,Café Ltd\n"
+        "ZOE@example.com,Zoë,Café Ltd\n"
+        "not-an-address,Bob,Acme\n".encode("utf-8")
+    )
+    loader = RecipientLoader(str(path))
+
+    assert loader.validate()
+    assert list(loader) == [
+        {"email": "zoe@example.com", "first_name": "Zoë", "company": "Café Ltd"}
+    ]
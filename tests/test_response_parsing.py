@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from email_generator import EmailGenerator, StreamingResponseParser
+
+RESPONSES = [
+    "SUBJECT: Backend Engineer application\nCONTENT: Hello,\n\nI'm interested.",
+    "SUBJECT:\nBackend Engineer application\nCONTENT:\nHello,\n\nI'm interested.",
+    "SUBJECT:  \n\n Backend Engineer application \n\nCONTENT:  Hello,\n\nThanks",
+    "SUBJECT: Backend Engineer application CONTENT: Hello,\n\nI'm interested.",
+]
+
+
+def stream(chunks):
+    parser = StreamingResponseParser()
+    subjects, content = [], ""
+    for chunk in chunks:
+        subject, new_content = parser.feed(chunk)
+        if subject is not None:
+            subjects.append(subject)
+        content += new_content
+    return subjects, content
+
+
+@pytest.mark.parametrize("response", RESPONSES)
+def test_streamed_parse_matches_parse_response_for_every_split(response):
+    content, subject = EmailGenerator(cache=False).parse_response(response)
+
+    splits = [[response]]
+    splits += [[response[:i], response[i:]] for i in range(1, len(response))]
+    splits += [
+        [response[i : i + size] for i in range(0, len(response), size)]
+        for size in (1, 2, 3, 7)
+    ]
+    for chunks in splits:
+        # The subject is reported exactly once, and content arrives unchanged
+        assert stream(chunks) == ([subject], content), chunks
+
+
+def test_subject_waits_for_its_line_to_complete():
+    parser = StreamingResponseParser()
+
+    assert parser.feed("SUBJECT:\n") == (None, "")
+    assert parser.feed("Backend Eng") == (None, "")
+    assert parser.feed("ineer\nCONT") == ("Backend Engineer", "")
+    assert parser.feed("ENT: Hello") == (None, "Hello")
+
+
+SEGMENTS = ["Recruiters", "Engineers", "Founders"]
+
+
+def variants(*items) -> str:
+    return json.dumps({"variants": list(items)})
+
+
+def test_parse_variants_matches_segments_by_name():
+    response = variants(
+        {"segment": " founders ", "subject": "For founders", "content": "F body"},
+        {"segment": "Recruiters", "subject": "For recruiters\nextra", "content": "R"},
+        {"segment": "ENGINEERS", "subject": "For engineers", "content": " E body "},
+    )
+
+    assert EmailGenerator(cache=False).parse_variants(response, SEGMENTS) == {
+        "Recruiters": ("R", "For recruiters"),
+        "Engineers": ("E body", "For engineers"),
+        "Founders": ("F body", "For founders"),
+    }
+
+
+def test_parse_variants_falls_back_to_position():
+    response = variants(
+        {"segment": "Engineers", "subject": "E", "content": "E body"},
+        {"segment": "hiring managers", "subject": "1", "content": "First"},
+        {"subject": "2", "content": "Second"},
+    )
+
+    assert EmailGenerator(cache=False).parse_variants(response, SEGMENTS) == {
+        "Recruiters": ("First", "1"),
+        "Engineers": ("E body", "E"),
+        "Founders": ("Second", "2"),
+    }
+
+
+def test_parse_variants_with_short_or_incomplete_variants():
+    response = variants(
+        {"segment": "Recruiters", "subject": "", "content": "No subject"},
+        "not a variant",
+        {"segment": "Engineers", "subject": "No content"},
+    )
+
+    # Founders has no variant left to fall back to
+    assert EmailGenerator(cache=False).parse_variants(response, SEGMENTS) == {
+        "Recruiters": ("No subject", None),
+        "Engineers": (None, "No content"),
+        "Founders": (None, None),
+    }
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        '{"variants": [{"segment": "Recruiters", "subject": "Cut off',
+        '["not", "an", "object"]',
+        '{"variants": 3}',
+        '{"emails": []}',
+        "",
+    ],
+)
+def test_parse_variants_with_malformed_responses(response):
+    assert EmailGenerator(cache=False).parse_variants(response, SEGMENTS) == {
+        segment: (None, None) for segment in SEGMENTS
+    }
@@ -0,0 +1,38 @@
+import time
+
+import email_sender
+from conftest import FakeGmail, FakeHttpError, make_sender
+
+TEMPLATE = "Hello,\n\nI'm interested in the role."
+
+
+def test_due_retry_with_a_full_window_does_not_spin(monkeypatch):
+    monkeypatch.setattr(email_sender, "SEND_ADAPTIVE_RATE", False)
+    throttled = FakeHttpError(429, "userRateLimitExceeded", {"retry-after": "0.01"})
+    gmail = FakeGmail(errors={1: throttled}, latency=0.5)
+    recipients = [f"person{i}@example.com" for i in range(3)]
+
+    cpu_started = time.process_time()
+    stats = make_sender(gmail).send_bulk_emails(
+        recipients, "Application", TEMPLATE, max_workers=1, rate_limit=0
+    )
+    cpu_seconds = time.process_time() - cpu_started
+
+    assert stats["successful"] == 3
+    # Without a timeout while the window is full, the ~1 s spent waiting on
+    # the two queued sends would be spent polling
+    assert cpu_seconds < 0.2, cpu_seconds
+
+
+def test_batched_send_stops_when_quota_is_exhausted(monkeypatch):
+    monkeypatch.setattr(email_sender, "backoff_delay", lambda attempt: 0)
+    gmail = FakeGmail(batch_errors={2: FakeHttpError(403, "dailyLimitExceeded")})
+    recipients = [f"person{i}@example.com" for i in range(6)]
+
+    stats = make_sender(gmail).send_bulk_emails_batched(
+        recipients, "Application", TEMPLATE, batch_size=2, max_retries=3
+    )
+
+    assert gmail.batches == 2
+    assert stats["successful"] == 2
+    assert stats["failed"] == 2
@@ -0,0 +1,38 @@
+import logging
+
+from logger import logger
+from speculation import Speculation
+
+
+class Recorder(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def work(message: str) -> str:
+    logger.info(message)
+    return message.upper()
+
+
+def test_background_logs_are_held_until_the_result_is_collected():
+    recorder = Recorder()
+    logger.addHandler(recorder)
+    try:
+        speculation = Speculation()
+        speculation.start("kept", work, "kept task output")
+        speculation.start("dropped", work, "dropped task output")
+        speculation.tasks["kept"]._thread.join()
+        speculation.tasks["dropped"]._thread.join()
+        logger.info("operator prompt")
+
+        assert recorder.messages == ["operator prompt"]
+        assert speculation.result("kept") == "KEPT TASK OUTPUT"
+        speculation.cancel()
+    finally:
+        logger.removeHandler(recorder)
+
+    assert recorder.messages == ["operator prompt", "kept task output"]
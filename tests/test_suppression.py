@@ -0,0 +1,76 @@
+import types
+
+import pytest
+
+import suppression
+from suppression import (
+    DUPLICATE,
+    RECENTLY_CONTACTED,
+    SuppressionIndex,
+    address_hash,
+    normalize_address,
+)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "suppression.sqlite3")
+
+
+@pytest.mark.parametrize(
+    "email, expected",
+    [
+        ("Jane.Doe+jobs@GoogleMail.com", "janedoe@gmail.com"),
+        (" j.a.n.e@gmail.com ", "jane@gmail.com"),
+        ("Jane.Doe+jobs@Example.com", "jane.doe@example.com"),
+        ("jane+a+b@example.com", "jane@example.com"),
+    ],
+)
+def test_normalize_address(email, expected):
+    assert normalize_address(email) == expected
+
+
+def test_variants_of_a_mailbox_share_a_hash():
+    assert address_hash("jane.doe@gmail.com") == address_hash(
+        "JaneDoe+x@googlemail.com"
+    )
+    assert address_hash("jane.doe@example.com") != address_hash("janedoe@example.com")
+
+
+def test_bounces_and_complaints_stay_suppressed_across_opens(path):
+    with SuppressionIndex(path) as index:
+        assert index.suppress(["bounce@example.com"], "bounced") == 1
+        assert index.suppress(["Angry+x@example.com", ""], "complained") == 1
+
+    with SuppressionIndex(path, "campaign") as index:
+        assert index.check("bounce@example.com") == "bounced"
+        assert index.check("angry@example.com") == "complained"
+        assert index.check("fine@example.com") is None
+
+
+def test_duplicates_within_a_campaign_are_skipped(path):
+    with SuppressionIndex(path, "campaign") as index:
+        assert index.check("jane.doe@gmail.com") is None
+        assert index.check("janedoe+jobs@googlemail.com") == DUPLICATE
+        assert index.check("other@example.com") is None
+
+
+def test_recontact_window(path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(suppression, "time", types.SimpleNamespace(time=lambda: now[0]))
+    with SuppressionIndex(path, "first") as index:
+        index.record_sent("jane@example.com")
+
+    # Another campaign within the window skips the address
+    with SuppressionIndex(path, "second", recontact_days=7) as index:
+        assert index.check("jane@example.com") == RECENTLY_CONTACTED
+    # The campaign that sent it is left to its journal
+    with SuppressionIndex(path, "first", recontact_days=7) as index:
+        assert index.check("jane@example.com") is None
+    # The check is off without a window
+    with SuppressionIndex(path, "second") as index:
+        assert index.check("jane@example.com") is None
+
+    now[0] += 8 * 24 * 60 * 60
+    with SuppressionIndex(path, "second", recontact_days=7) as index:
+        assert index.check("jane@example.com") is None